@@ -20,84 +20,331 @@
 """
 
 import rasterio
+from rasterio.transform import Affine, rowcol
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
 import os
 import sys
 import json
-import glob
+import logging
+import re
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 import numpy as np
 
+# Numba为可选依赖：未安装时退回到纯NumPy实现
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# orjson为可选依赖：未安装时使用标准库json导出
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# WorldPop标准文件名：chn_ppp_YYYY.tif，年份范围（2000-2020）直接编码在正则中
+_YEAR_RE = re.compile(r'^chn_ppp_(20[01]\d|2020)\.tif$', re.ASCII)
+
+# 多年份并发查询的最大线程数（GDAL解码时会释放GIL）
+MAX_QUERY_WORKERS = 8
+
+# 多年份趋势分析使用的结构化数组字段（float64，避免趋势拟合时的精度损失）
+TREND_DTYPE = [('year', 'i4'), ('density', 'f8'), ('total', 'f8'), ('avg', 'f8')]
+
+# 批量查询外包窗口的像素上限（约16MB float32）；点位分散超过上限时改为逐点读取
+MAX_BATCH_WINDOW_PIXELS = 4 * 1024 * 1024
+
+# GDAL运行时配置：保留块缓存，避免重复解码相同的瓦片
+GDAL_ENV_OPTIONS = {
+    'GDAL_CACHEMAX': 512,
+    'CPL_VSIL_CURL_ALLOWED_EXTENSIONS': '.tif'
+}
+
+def _nan_masked(a: np.ndarray, nodata: float, has_nodata: bool) -> np.ndarray:
+    """转为float32并把NoData替换为NaN；NoData与NaN统一视为无效像素"""
+    w = a.astype(np.float32, copy=False)
+    if has_nodata:
+        w = np.where(w == nodata, np.float32(np.nan), w)
+    return w
+
+if NUMBA_AVAILABLE:
+    # 只开启重结合与乘加融合；完整的fastmath会假定没有NaN，把下面的NaN判断优化掉
+    @njit(cache=True, fastmath={'reassoc', 'contract'})
+    def _window_stats(a, nodata, has_nodata):
+        """单次遍历窗口，返回 (总和, 平方和, 最小值, 最大值, 有效像素数)"""
+        # 总和与极值使用float32累加；平方和保留float64，避免方差计算时的相消误差
+        total = np.float32(0.0)
+        total_sq = 0.0
+        min_v = np.float32(np.inf)
+        max_v = np.float32(-np.inf)
+        count = 0
+        for i in range(a.shape[0]):
+            for j in range(a.shape[1]):
+                v = np.float32(a[i, j])
+                # NaN与NoData同样跳过，与NumPy回退实现一致
+                if v != v or (has_nodata and v == nodata):
+                    continue
+                total += v
+                total_sq += np.float64(v) * v
+                if v < min_v:
+                    min_v = v
+                if v > max_v:
+                    max_v = v
+                count += 1
+        if count == 0:
+            return np.float32(0.0), 0.0, np.float32(0.0), np.float32(0.0), 0
+        return total, total_sq, min_v, max_v, count
+else:
+    def _window_stats(a, nodata, has_nodata):
+        """单次遍历窗口，返回 (总和, 平方和, 最小值, 最大值, 有效像素数)"""
+        # NoData一次性替换为NaN，后续归约直接跳过，无需再生成布尔索引后的副本
+        w = _nan_masked(a, nodata, has_nodata)
+        count = int(w.size - np.count_nonzero(np.isnan(w)))
+        if count == 0:
+            return 0.0, 0.0, 0.0, 0.0, 0
+        return (float(np.nansum(w, dtype=np.float32)), float(np.nansum(np.square(w, dtype=np.float64))),
+                float(np.nanmin(w)), float(np.nanmax(w)), count)
+
+def _needs_reprojection(src) -> bool:
+    """文件坐标系不是EPSG:4326（经纬度）时需要重投影"""
+    return src.crs is not None and src.crs.to_epsg() != 4326
+
+def _fast_median(a: np.ndarray) -> float:
+    """用np.partition求中位数，只需O(n)选择而非完整排序"""
+    n = a.size
+    k = n // 2
+    part = np.partition(a, k)
+    if n & 1:
+        return float(part[k])
+    return 0.5 * (float(part[k]) + float(part[:k].max()))
+
 class LocalPopulationQuery:
     """本地人口密度数据查询器"""
     
-    def __init__(self, data_dir: str = "."):
+    def __init__(self, data_dir: str = ".", verbose: bool = False):
         self.data_dir = data_dir
+        self.verbose = verbose
+        self._open: Dict[Tuple[str, Optional[int]], rasterio.DatasetReader] = {}
+        self._open_lock = threading.Lock()
+        # 读取视图（重投影视图或原数据集）的仿射变换，避免每次查询都从GDAL重新构建
+        self._transforms: Dict[Tuple[str, Optional[int]], Affine] = {}
+        # 窗口读取缓冲区，按线程和数据集复用，不足时按需扩容；多年份查询会并发读取，不能跨线程共享
+        self._local = threading.local()
+        # 非EPSG:4326文件的重投影视图，按需构建
+        self._vrt: Dict[Tuple[str, Optional[int]], WarpedVRT] = {}
+        # 扫描时预先读取的文件元数据（范围、坐标系、像素面积等）
+        self._meta: Dict[str, Dict[str, Any]] = {}
         self.available_files = self._scan_files()
-        print(f"📁 数据目录: {os.path.abspath(data_dir)}")
-        print(f"📊 发现 {len(self.available_files)} 个人口数据文件")
+        log.info("📁 数据目录: %s", os.path.abspath(data_dir))
+        log.info("📊 发现 %d 个人口数据文件", len(self.available_files))
         
     def _scan_files(self) -> Dict[int, str]:
         """扫描可用的人口数据文件"""
         files = {}
         
-        # 扫描标准命名格式的文件
-        pattern = os.path.join(self.data_dir, "chn_ppp_*.tif")
-        for filepath in glob.glob(pattern):
-            filename = os.path.basename(filepath)
-            try:
-                # 从文件名提取年份
-                year_str = filename.split('_')[-1].replace('.tif', '')
-                year = int(year_str)
-                if 2000 <= year <= 2020:
-                    files[year] = filepath
-                    print(f"  ✅ {year}年: {filename}")
-            except ValueError:
-                continue
+        # 目录不存在时视为没有数据文件（与原先glob的行为一致），由调用方给出使用说明
+        try:
+            with os.scandir(self.data_dir) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            return files
+        
+        # 单次遍历目录，用预编译正则匹配标准命名格式并提取年份
+        for entry in entries:
+            match = _YEAR_RE.match(entry.name)
+            if match and entry.is_file():
+                year = int(match.group(1))
+                files[year] = entry.path
+                log.info("  ✅ %d年: %s", year, entry.name)
+                try:
+                    self._load_meta(entry.path)
+                except Exception as e:
+                    log.warning("     ⚠️ 读取文件元数据失败: %s", e)
+        
+        # 缺少概览层的文件只汇总提示一次，逐个文件的命令在DEBUG级别输出
+        missing = sum(1 for path in files.values()
+                      if path in self._meta and not self._meta[path]['has_overviews'])
+        if missing:
+            log.info("💡 %d 个文件未发现概览层，粗分辨率查询前可运行: "
+                     "rio overview --build 2,4,8,16 --resampling average <文件>", missing)
         
         # 如果没找到标准格式，列出所有tif文件供用户参考
         if not files:
-            tif_files = glob.glob(os.path.join(self.data_dir, "*.tif"))
+            tif_files = [entry.name for entry in entries if entry.name.endswith('.tif')]
             if tif_files:
-                print("📋 发现以下TIF文件，请检查是否为WorldPop数据:")
+                log.info("📋 发现以下TIF文件，请检查是否为WorldPop数据:")
                 for f in tif_files:
-                    print(f"  📄 {os.path.basename(f)}")
+                    log.info("  📄 %s", f)
         
         return files
     
+    def _load_meta(self, filepath: str) -> Dict[str, Any]:
+        """读取并缓存文件元数据，缺少概览（金字塔）时给出构建提示"""
+        with rasterio.open(filepath) as base:
+            has_overviews = bool(base.overviews(1))
+            crs = str(base.crs)
+            # 范围与分辨率统一以经纬度表示，投影坐标系的文件经重投影视图读取
+            if _needs_reprojection(base):
+                with WarpedVRT(base, crs='EPSG:4326') as src:
+                    meta = self._describe(src)
+            else:
+                meta = self._describe(base)
+        
+        meta.update({
+            'crs': crs,
+            'size_mb': os.path.getsize(filepath) / (1024 * 1024),
+            'has_overviews': has_overviews
+        })
+        self._meta[filepath] = meta
+        
+        if not meta['has_overviews']:
+            log.debug("     💡 未发现概览层，粗分辨率查询前可运行: "
+                      "rio overview --build 2,4,8,16 --resampling average %s", filepath)
+        return meta
+    
+    @staticmethod
+    def _describe(src) -> Dict[str, Any]:
+        """提取经纬度坐标系下的范围、分辨率等信息"""
+        transform = src.transform
+        return {
+            'bounds': src.bounds,
+            'transform': transform,
+            'width': src.width,
+            'height': src.height,
+            'nodata': src.nodata,
+            'pixel_area_km2': abs(transform.a * transform.e) * (111.32 ** 2)
+        }
+    
+    def _get_meta(self, filepath: str) -> Dict[str, Any]:
+        """获取文件元数据（未扫描过的文件在首次访问时读取）"""
+        meta = self._meta.get(filepath)
+        if meta is None:
+            meta = self._load_meta(filepath)
+        return meta
+    
+    def _get_src(self, filepath: str, overview_level: Optional[int] = None) -> rasterio.DatasetReader:
+        """获取已打开的数据集句柄（首次访问时打开并缓存）"""
+        key = (filepath, overview_level)
+        with self._open_lock:
+            src = self._open.get(key)
+            if src is None or src.closed:
+                if overview_level is None:
+                    src = rasterio.open(filepath, sharing=False)
+                else:
+                    src = rasterio.open(filepath, sharing=False, overview_level=overview_level)
+                self._open[key] = src
+                # 底层数据集已关闭时，旧的重投影视图一并关闭，避免句柄泄漏
+                stale_vrt = self._vrt.pop(key, None)
+                if stale_vrt is not None:
+                    try:
+                        stale_vrt.close()
+                    except Exception:
+                        pass
+                # 非经纬度坐标系时构建重投影视图；注意VRT每次读取瓦片都会产生重投影开销
+                if _needs_reprojection(src):
+                    self._vrt[key] = WarpedVRT(src, crs='EPSG:4326')
+                self._transforms[key] = self._vrt.get(key, src).transform
+            return self._vrt.get(key, src)
+    
+    def _pixel_index(self, src, filepath: str, overview_level: Optional[int],
+                     longitude: float, latitude: float) -> Tuple[int, int]:
+        """
+        地理坐标转像素行列号
+        
+        使用缓存的仿射变换，但取整交给rasterio的rowcol，与src.index的结果逐位一致；
+        自行用 (lat - f) / e 取整时，恰好落在像素边界上的坐标会因浮点舍入落到相邻像素
+        """
+        transform = self._transforms.get((filepath, overview_level))
+        if transform is None:
+            return src.index(longitude, latitude)
+        row, col = rowcol(transform, longitude, latitude)
+        return int(row), int(col)
+    
+    def _read_window(self, src, filepath: str, overview_level: Optional[int], win: Window) -> np.ndarray:
+        """读取窗口数据到当前线程按文件预分配的缓冲区，避免每次查询都分配新数组"""
+        height, width = int(win.height), int(win.width)
+        key = (filepath, overview_level)
+        bufs = getattr(self._local, 'bufs', None)
+        if bufs is None:
+            bufs = self._local.bufs = {}
+        buf = bufs.get(key)
+        if buf is None or buf.size < height * width:
+            buf = np.empty(height * width, dtype=src.dtypes[0])
+            bufs[key] = buf
+        out = buf[:height * width].reshape(height, width)
+        return src.read(1, window=win, out=out, boundless=False)
+    
+    def close(self):
+        """关闭所有缓存的数据集句柄"""
+        with self._open_lock:
+            for src in list(self._vrt.values()) + list(self._open.values()):
+                try:
+                    src.close()
+                except Exception:
+                    pass
+            self._vrt.clear()
+            self._open.clear()
+            self._transforms.clear()
+            self._local = threading.local()
+    
+    def __del__(self):
+        self.close()
+    
     def list_available_years(self) -> List[int]:
         """列出可用的年份"""
         return sorted(self.available_files.keys())
     
-    def query_single_coordinate(self, filepath: str, latitude: float, longitude: float) -> Dict[str, Any]:
-        """查询单个坐标的人口密度"""
+    def query_single_coordinate(self, filepath: str, latitude: float, longitude: float,
+                                overview_level: Optional[int] = None) -> Dict[str, Any]:
+        """
+        查询单个坐标的人口密度
+        
+        overview_level 为 None 时读取全分辨率数据；指定时读取对应的概览层
+        （0 表示第一级概览），适用于只关心周边聚合统计的查询。
+        概览层的 transform 已反映降采样后的分辨率，像素面积会相应放大。
+        """
         try:
-            with rasterio.open(filepath) as src:
-                # 获取文件基本信息
-                bounds = src.bounds
-                crs = src.crs
-                transform = src.transform
+            # 先用缓存的范围做边界检查，超出范围时无需打开数据集
+            meta = self._get_meta(filepath)
+            bounds = meta['bounds']
+            crs = meta['crs']
+            
+            if not (bounds.left <= longitude <= bounds.right and 
+                   bounds.bottom <= latitude <= bounds.top):
+                return {
+                    'error': '坐标超出数据范围',
+                    'coordinate': (latitude, longitude),
+                    'data_bounds': {
+                        'left': bounds.left, 'right': bounds.right,
+                        'bottom': bounds.bottom, 'top': bounds.top
+                    }
+                }
+            
+            with rasterio.Env(**GDAL_ENV_OPTIONS):
+                src = self._get_src(filepath, overview_level)
                 
-                print(f"📊 文件信息:")
-                print(f"• 文件: {os.path.basename(filepath)}")
-                print(f"• 坐标系统: {crs}")
-                print(f"• 数据范围: {bounds}")
-                print(f"• 分辨率: {transform[0]:.6f}° × {abs(transform[4]):.6f}°")
-                print(f"• 数据大小: {src.width} × {src.height} 像素")
+                # 概览层的分辨率不同，需取自src
+                transform = meta['transform'] if overview_level is None else src.transform
                 
-                # 检查坐标是否在范围内
-                if not (bounds.left <= longitude <= bounds.right and 
-                       bounds.bottom <= latitude <= bounds.top):
-                    return {
-                        'error': '坐标超出数据范围',
-                        'coordinate': (latitude, longitude),
-                        'data_bounds': {
-                            'left': bounds.left, 'right': bounds.right,
-                            'bottom': bounds.bottom, 'top': bounds.top
-                        }
-                    }
+                # 文件信息仅在verbose模式下输出，单点/批量查询时不做格式化
+                if self.verbose:
+                    log.info("📊 文件信息:")
+                    log.info("• 文件: %s", os.path.basename(filepath))
+                    log.info("• 坐标系统: %s", crs)
+                    log.info("• 数据范围: %s", bounds)
+                    log.info("• 分辨率: %.6f° × %.6f°", transform[0], abs(transform[4]))
+                    log.info("• 数据大小: %d × %d 像素", meta['width'], meta['height'])
                 
                 # 将地理坐标转换为像素坐标
-                row, col = src.index(longitude, latitude)
+                row, col = self._pixel_index(src, filepath, overview_level, longitude, latitude)
                 
                 # 确保像素坐标在有效范围内
                 if not (0 <= row < src.height and 0 <= col < src.width):
@@ -107,34 +354,55 @@ class LocalPopulationQuery:
                         'pixel_coordinate': (row, col)
                     }
                 
+                # 只读取覆盖最大统计半径的窗口，避免整波段读入内存
+                radii = [1, 3, 5]
+                window_size = 2
+                max_radius = max(radii + [window_size])
+                win = Window(
+                    col - max_radius, row - max_radius,
+                    2 * max_radius + 1, 2 * max_radius + 1
+                ).intersection(Window(0, 0, src.width, src.height))
+                arr = self._read_window(src, filepath, overview_level, win)
+                
+                # 中心像素在窗口数组中的局部坐标
+                local_row = row - int(win.row_off)
+                local_col = col - int(win.col_off)
+                
                 # 读取该位置的像素值
-                population_density = src.read(1)[row, col]
+                population_density = arr[local_row, local_col]
                 
                 # 处理NoData值
                 if src.nodata is not None and population_density == src.nodata:
                     population_density = 0.0
                 
                 # 计算周围区域的统计信息（5x5窗口）
-                window_size = 2
-                row_start = max(0, row - window_size)
-                row_end = min(src.height, row + window_size + 1)
-                col_start = max(0, col - window_size)
-                col_end = min(src.width, col + window_size + 1)
+                window_data = arr[max(0, local_row - window_size):local_row + window_size + 1,
+                                  max(0, local_col - window_size):local_col + window_size + 1]
                 
-                window_data = src.read(1)[row_start:row_end, col_start:col_end]
-                
-                # 过滤NoData值
-                if src.nodata is not None:
-                    valid_data = window_data[window_data != src.nodata]
+                # 单次遍历计算窗口统计量（NoData在内核中过滤）
+                has_nodata = src.nodata is not None
+                nodata = float(src.nodata) if has_nodata else 0.0
+                total, total_sq, min_v, max_v, count = _window_stats(window_data, nodata, has_nodata)
+                if count > 0:
+                    mean_v = total / count
+                    std_v = math.sqrt(max(total_sq / count - mean_v * mean_v, 0.0))
+                    # 中位数需要排序，单独计算；无效像素的判定与统计内核一致
+                    w = _nan_masked(window_data, nodata, has_nodata)
+                    median_v = _fast_median(w[~np.isnan(w)])
                 else:
-                    valid_data = window_data.flatten()
+                    mean_v = std_v = median_v = 0.0
                 
                 # 计算像素实际面积（平方公里）
                 # WorldPop数据大约是30弧秒分辨率
-                pixel_area_km2 = abs(transform[0] * transform[4]) * (111.32 ** 2)
+                if overview_level is None:
+                    pixel_area_km2 = meta['pixel_area_km2']
+                else:
+                    pixel_area_km2 = abs(transform[0] * transform[4]) * (111.32 ** 2)
                 
                 # 计算不同半径范围内的统计
-                radius_stats = self._calculate_radius_stats(src, row, col, [1, 3, 5])
+                radius_stats = self._calculate_radius_stats(
+                    arr, local_row, local_col, radii, src.nodata, pixel_area_km2
+                )
                 
                 return {
                     'coordinate': {
@@ -150,17 +418,17 @@ class LocalPopulationQuery:
                     },
                     'surrounding_stats': {
                         'window_size': f"{window_size*2+1}×{window_size*2+1}像素",
-                        'mean_density': float(np.mean(valid_data)) if len(valid_data) > 0 else 0.0,
-                        'max_density': float(np.max(valid_data)) if len(valid_data) > 0 else 0.0,
-                        'min_density': float(np.min(valid_data)) if len(valid_data) > 0 else 0.0,
-                        'std_density': float(np.std(valid_data)) if len(valid_data) > 0 else 0.0,
-                        'median_density': float(np.median(valid_data)) if len(valid_data) > 0 else 0.0,
-                        'sample_count': len(valid_data)
+                        'mean_density': float(mean_v),
+                        'max_density': float(max_v),
+                        'min_density': float(min_v),
+                        'std_density': float(std_v),
+                        'median_density': median_v,
+                        'sample_count': int(count)
                     },
                     'radius_analysis': radius_stats,
                     'data_info': {
                         'filepath': filepath,
-                        'crs': str(crs),
+                        'crs': crs,
                         'bounds': {
                             'left': bounds.left, 'bottom': bounds.bottom,
                             'right': bounds.right, 'top': bounds.top
@@ -168,7 +436,8 @@ class LocalPopulationQuery:
                         'resolution_degrees': {
                             'x': transform[0], 'y': abs(transform[4])
                         },
-                        'file_size_mb': os.path.getsize(filepath) / (1024 * 1024)
+                        'file_size_mb': meta['size_mb'],
+                        'overview_level': overview_level
                     }
                 }
                 
@@ -179,41 +448,126 @@ class LocalPopulationQuery:
                 'filepath': filepath
             }
     
-    def _calculate_radius_stats(self, src, center_row: int, center_col: int, radii: List[int]) -> Dict[str, Any]:
-        """计算不同半径范围内的统计信息"""
+    def query_coordinates_batch(self, points: List[Tuple[float, float]], year: int) -> Dict[str, Any]:
+        """
+        批量查询多个坐标的像素人口密度
+        
+        points 为 (纬度, 经度) 列表。所有点的像素坐标一次性向量化计算，
+        只读取覆盖全部有效点的最小外包窗口，再用花式索引取值；
+        点位相距过远、外包窗口超过 MAX_BATCH_WINDOW_PIXELS 时改为逐点读取单个像素。
+        """
+        if year not in self.available_files:
+            return {'year': year, 'error': f'{year}年数据文件不存在'}
+        
+        filepath = self.available_files[year]
+        if not points:
+            return {'year': year, 'filepath': filepath, 'results': []}
+        
+        try:
+            with rasterio.Env(**GDAL_ENV_OPTIONS):
+                src = self._get_src(filepath)
+                transform = self._transforms.get((filepath, None)) or src.transform
+                
+                # 向量化地理坐标 -> 像素坐标（与src.index相同的取整规则）
+                lats = np.array([p[0] for p in points], dtype=np.float64)
+                lons = np.array([p[1] for p in points], dtype=np.float64)
+                rows, cols = rowcol(transform, lons, lats)
+                rows = np.asarray(rows, dtype=np.int64)
+                cols = np.asarray(cols, dtype=np.int64)
+                inside = (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+                
+                densities = np.zeros(len(points), dtype=np.float64)
+                if inside.any():
+                    rows_in, cols_in = rows[inside], cols[inside]
+                    rmin, rmax = int(rows_in.min()), int(rows_in.max())
+                    cmin, cmax = int(cols_in.min()), int(cols_in.max())
+                    
+                    height, width = rmax - rmin + 1, cmax - cmin + 1
+                    if height * width <= MAX_BATCH_WINDOW_PIXELS:
+                        # 读取覆盖所有点的最小窗口
+                        arr = src.read(1, window=Window(cmin, rmin, width, height))
+                        values = arr[rows_in - rmin, cols_in - cmin]
+                    else:
+                        # 点位分散时外包窗口可达数百MB，逐点读取单个像素
+                        values = np.array([
+                            self._read_window(src, filepath, None, Window(int(c), int(r), 1, 1))[0, 0]
+                            for r, c in zip(rows_in, cols_in)
+                        ])
+                    if src.nodata is not None:
+                        values = np.where(values == src.nodata, 0, values)
+                    densities[inside] = values
+                
+                pixel_area_km2 = self._get_meta(filepath)['pixel_area_km2']
+        
+        except Exception as e:
+            return {
+                'year': year,
+                'error': f'数据读取失败: {e}',
+                'filepath': filepath
+            }
+        
+        results = []
+        for i, (latitude, longitude) in enumerate(points):
+            if not inside[i]:
+                results.append({
+                    'error': '坐标超出数据范围',
+                    'coordinate': (latitude, longitude)
+                })
+                continue
+            
+            density = float(densities[i])
+            results.append({
+                'coordinate': {
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'pixel_row': int(rows[i]),
+                    'pixel_col': int(cols[i])
+                },
+                'population_data': {
+                    'density_per_km2': density,
+                    'total_population_in_pixel': density * pixel_area_km2,
+                    'pixel_area_km2': pixel_area_km2
+                }
+            })
+        
+        return {'year': year, 'filepath': filepath, 'results': results}
+    
+    def _calculate_radius_stats(self, arr: np.ndarray, center_row: int, center_col: int,
+                                radii: List[int], nodata: Optional[float],
+                                pixel_area_km2: float) -> Dict[int, Any]:
+        """计算不同半径范围内的统计信息（基于已读取的窗口数组，以半径像素数为键）"""
         stats = {}
+        has_nodata = nodata is not None
+        nodata_value = float(nodata) if has_nodata else 0.0
         
         for radius in radii:
             row_start = max(0, center_row - radius)
-            row_end = min(src.height, center_row + radius + 1)
+            row_end = center_row + radius + 1
             col_start = max(0, center_col - radius)
-            col_end = min(src.width, center_col + radius + 1)
+            col_end = center_col + radius + 1
             
-            window_data = src.read(1)[row_start:row_end, col_start:col_end]
+            window_data = arr[row_start:row_end, col_start:col_end]
             
-            # 过滤NoData值
-            if src.nodata is not None:
-                valid_data = window_data[window_data != src.nodata]
-            else:
-                valid_data = window_data.flatten()
+            total, _, _, max_v, count = _window_stats(window_data, nodata_value, has_nodata)
             
-            if len(valid_data) > 0:
-                stats[f"radius_{radius}"] = {
-                    'mean_density': float(np.mean(valid_data)),
-                    'total_population': float(np.sum(valid_data)),
-                    'max_density': float(np.max(valid_data)),
-                    'pixel_count': len(valid_data),
-                    'area_km2': len(valid_data) * abs(src.transform[0] * src.transform[4]) * (111.32 ** 2)
+            if count > 0:
+                stats[radius] = {
+                    'mean_density': float(total / count),
+                    'total_population': float(total),
+                    'max_density': float(max_v),
+                    'pixel_count': int(count),
+                    'area_km2': count * pixel_area_km2
                 }
             else:
-                stats[f"radius_{radius}"] = {
+                stats[radius] = {
                     'mean_density': 0.0, 'total_population': 0.0,
                     'max_density': 0.0, 'pixel_count': 0, 'area_km2': 0.0
                 }
         
         return stats
     
-    def query_multiple_years(self, latitude: float, longitude: float, years: List[int] = None) -> Dict[str, Any]:
+    def query_multiple_years(self, latitude: float, longitude: float, years: List[int] = None,
+                             overview_level: Optional[int] = None) -> Dict[str, Any]:
         """查询多个年份的人口数据"""
         if years is None:
             years = self.list_available_years()
@@ -221,38 +575,56 @@ class LocalPopulationQuery:
         if not years:
             return {'error': '没有可用的数据文件'}
         
-        print(f"🎯 批量查询人口密度数据")
-        print(f"📍 坐标: ({latitude}, {longitude})")
-        print(f"📅 年份: {', '.join(map(str, years))}")
-        print("=" * 60)
+        sys.stdout.write("\n".join([
+            "🎯 批量查询人口密度数据",
+            f"📍 坐标: ({latitude}, {longitude})",
+            f"📅 年份: {', '.join(map(str, years))}",
+            "=" * 60
+        ]) + "\n")
         
         results = {}
         successful_years = []
         failed_years = []
         
-        for year in sorted(years):
+        def _query_one(year: int) -> Optional[Dict[str, Any]]:
             if year not in self.available_files:
+                return None
+            filepath = self.available_files[year]
+            return self.query_single_coordinate(filepath, latitude, longitude, overview_level)
+        
+        # 各年份文件相互独立，并发查询以重叠瓦片解码；结果按年份顺序在主线程输出
+        sorted_years = sorted(years)
+        with ThreadPoolExecutor(max_workers=min(MAX_QUERY_WORKERS, len(sorted_years))) as executor:
+            year_results = list(executor.map(_query_one, sorted_years))
+        
+        # 逐年状态行先收集，循环结束后一次性写出
+        lines: List[str] = []
+        trend_rows: List[Tuple[int, float, float, float]] = []
+        for year, result in zip(sorted_years, year_results):
+            if result is None:
                 results[str(year)] = {
                     'year': year,
                     'error': f'{year}年数据文件不存在'
                 }
                 failed_years.append(year)
-                print(f"❌ {year}年: 文件不存在")
+                lines.append(f"❌ {year}年: 文件不存在")
                 continue
             
-            filepath = self.available_files[year]
-            result = self.query_single_coordinate(filepath, latitude, longitude)
             result['year'] = year
             results[str(year)] = result
             
             if 'error' in result:
                 failed_years.append(year)
-                print(f"❌ {year}年: {result['error']}")
+                lines.append(f"❌ {year}年: {result['error']}")
             else:
                 successful_years.append(year)
                 density = result['population_data']['density_per_km2']
                 total_pop = result['population_data']['total_population_in_pixel']
-                print(f"✅ {year}年: {density:.2f} 人/km² (该像素总人口: {total_pop:.0f})")
+                lines.append(f"✅ {year}年: {density:.2f} 人/km² (该像素总人口: {total_pop:.0f})")
+                trend_rows.append((year, density, total_pop, result['surrounding_stats']['mean_density']))
+        
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         
         # 生成汇总信息
         summary = {
@@ -263,7 +635,9 @@ class LocalPopulationQuery:
                 'failed_years': failed_years,
                 'success_rate': len(successful_years) / len(years) * 100 if years else 0
             },
-            'yearly_data': results
+            'yearly_data': results,
+            # 成功年份按年份排序的结构化数组，仅供趋势分析使用，导出时剔除
+            'trend_array': np.array(trend_rows, dtype=TREND_DTYPE)
         }
         
         return summary
@@ -307,8 +681,7 @@ class LocalPopulationQuery:
         print(f"• 标准差: {stats['std_density']:.2f}")
         
         print(f"\n📐 不同半径范围分析:")
-        for radius_key, radius_data in radius_stats.items():
-            radius = radius_key.split('_')[1]
+        for radius, radius_data in radius_stats.items():
             print(f"• {radius}像素半径 (~{int(radius)*1:.1f}km): "
                   f"平均{radius_data['mean_density']:.1f}人/km², "
                   f"总人口{radius_data['total_population']:.0f}人, "
@@ -330,9 +703,6 @@ class LocalPopulationQuery:
         print(f"{'年份':<6} {'人口密度':<12} {'像素人口':<10} {'周边平均':<12} {'状态':<8}")
         print("-" * 70)
         
-        # 收集成功的数据用于趋势分析
-        trend_data = []
-        
         for year_str in sorted(result['yearly_data'].keys()):
             year_data = result['yearly_data'][year_str]
             year = year_data['year']
@@ -345,13 +715,15 @@ class LocalPopulationQuery:
                 avg_density = year_data['surrounding_stats']['mean_density']
                 
                 print(f"{year:<6} {density:<12.1f} {total_pop:<10.0f} {avg_density:<12.1f} {'成功':<8}")
-                trend_data.append((year, density))
         
-        # 趋势分析
-        if len(trend_data) >= 2:
-            trend_data.sort()
-            first_year, first_density = trend_data[0]
-            last_year, last_density = trend_data[-1]
+        # 趋势分析（直接对结构化数组的列切片运算）
+        trend = result['trend_array']
+        
+        if trend.size >= 2:
+            years_arr = trend['year']
+            densities = trend['density']
+            first_year, last_year = int(years_arr[0]), int(years_arr[-1])
+            first_density, last_density = float(densities[0]), float(densities[-1])
             
             change = last_density - first_density
             change_rate = (change / first_density * 100) if first_density > 0 else 0
@@ -362,6 +734,10 @@ class LocalPopulationQuery:
             print(f"• 绝对变化: {change:+.1f} 人/平方公里")
             print(f"• 相对变化: {change_rate:+.1f}%")
             
+            # 线性趋势斜率
+            slope = np.polyfit(years_arr.astype(np.float64), densities, 1)[0]
+            print(f"• 线性趋势: {slope:+.2f} 人/平方公里/年")
+            
             # 年均变化率
             years_span = last_year - first_year
             if years_span > 0:
@@ -381,18 +757,36 @@ class LocalPopulationQuery:
                 year = result['year']
                 filename = f"population_{year}_{lat}_{lon}.json"
         
+        # 趋势数组只用于显示分析，不写入导出文件，导出格式保持不变
+        if 'trend_array' in result:
+            result = {key: value for key, value in result.items() if key != 'trend_array'}
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(
+                        result,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    ))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
             print(f"📁 结果已导出到: {filename}")
         except Exception as e:
             print(f"❌ 导出失败: {e}")
 
 def main():
     """主函数"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("🏠 本地WorldPop人口密度查询工具")
     print("=" * 50)
     
+    # -v 输出每次查询的文件信息
+    verbose = '-v' in sys.argv[1:]
+    if verbose:
+        sys.argv = [arg for arg in sys.argv if arg != '-v']
+    
     # 检查命令行参数中的数据目录
     data_dir = "."
     if len(sys.argv) > 1 and os.path.isdir(sys.argv[1]):
@@ -400,7 +794,7 @@ def main():
         sys.argv = [sys.argv[0]] + sys.argv[2:]  # 移除数据目录参数
     
     # 初始化查询器
-    query_tool = LocalPopulationQuery(data_dir)
+    query_tool = LocalPopulationQuery(data_dir, verbose=verbose)
     
     if not query_tool.available_files:
         print("\n❌ 未找到WorldPop数据文件")
@@ -441,7 +835,7 @@ def main():
                     
         except ValueError:
             print("❌ 坐标格式错误")
-            print("使用方法: python local_population_query.py 纬度 经度 [年份]")
+            print("使用方法: python local_population_query.py [-v] [数据目录] 纬度 经度 [年份]")
             print("示例: python local_population_query.py 39.9042 116.4074 2020")
     else:
         # 交互式输入
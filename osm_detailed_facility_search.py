@@ -7,19 +7,153 @@ OpenStreetMap详细设施搜索工具
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import os
 import sys
 import time
 import math
-from typing import Dict, List, Optional, Tuple
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+# Numba为可选依赖：未安装时退回到纯NumPy实现
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# orjson为可选依赖：未安装时使用标准库json解析与导出
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 查询模板解析：元素类型 + 标签条件，如 way[natural=water][!water]
+_TEMPLATE_RE = re.compile(r'^(node|way|relation)((?:\[[^\]]+\])+)$')
+_CONDITION_RE = re.compile(r'\[(!?)([\w:]+)(?:=([\w:]+))?\]')
+
+# 回退为分类型查询时的最大并发数（Overpass对单IP并发有限制）
+MAX_CONCURRENT_QUERIES = 4
+
+# Overpass响应磁盘缓存的默认有效期（7天）
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# 每类设施只为距离最近的前K个way补充几何（节点、边界、面积）
+GEOMETRY_TOP_K = 20
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _poly_area_m2(lats, lons):
+        """Shoelace公式计算多边形面积（平方米），经纬度按等距近似换算为米"""
+        n = lats.size
+        # 同一多边形内纬度变化很小，用平均纬度的余弦统一缩放x，省去逐顶点的三角函数
+        kx = 111320.0 * np.cos(np.radians(lats.mean()))
+        ky = 110540.0
+        # 以首个顶点为原点，减小大坐标值相乘带来的舍入误差
+        x0 = lons[0]
+        y0 = lats[0]
+        s = 0.0
+        for i in range(n):
+            j = (i + 1) % n
+            s += (lons[i] - x0) * (lats[j] - y0) - (lons[j] - x0) * (lats[i] - y0)
+        return abs(s) * 0.5 * kx * ky
+else:
+    def _poly_area_m2(lats, lons):
+        """Shoelace公式计算多边形面积（平方米），经纬度按等距近似换算为米"""
+        # 同一多边形内纬度变化很小，用平均纬度的余弦统一缩放x，省去逐顶点的三角函数
+        kx = 111320.0 * math.cos(math.radians(float(lats.mean())))
+        ky = 110540.0
+        # 以首个顶点为原点，减小大坐标值相乘带来的舍入误差
+        x = lons - lons[0]
+        y = lats - lats[0]
+        s = float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+        return abs(s) * 0.5 * kx * ky
+
+@dataclass(slots=True)
+class Facility:
+    """解析后的单个设施；翻译后的标签在首次访问时才生成"""
+    # 基本信息
+    osm_id: str
+    osm_type: str
+    osm_internal_id: int
+    facility_type: str
+    category: str
+    icon: str
+    color: str
+    
+    # 名称信息
+    primary_name: str
+    names: Dict[str, str]
+    
+    # 位置信息
+    coordinates: Dict[str, Any]
+    distance: float
+    distance_formatted: str
+    
+    # 几何、联系、时间信息与详细属性
+    geometry: Dict[str, Any]
+    contact: Dict[str, str]
+    time_info: Dict[str, str]
+    attributes: Dict[str, str]
+    
+    # 原始OSM标签（与元素共享同一字典，不复制）
+    osm_tags: Dict[str, str] = field(repr=False)
+    
+    # 元数据
+    last_modified: Any
+    version: Any
+    changeset: Any
+    
+    _translator: Callable[[Dict], Dict] = field(default=dict, repr=False, compare=False)
+    _translated_tags: Optional[Dict[str, str]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def translated_tags(self) -> Dict[str, str]:
+        """翻译为中文的OSM标签（惰性计算并缓存）"""
+        if self._translated_tags is None:
+            self._translated_tags = self._translator(self.osm_tags)
+        return self._translated_tags
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为导出用的字典，字段顺序与原始结果格式一致"""
+        data = {}
+        for f in fields(self):
+            if f.name.startswith('_'):
+                continue
+            data[f.name] = getattr(self, f.name)
+            if f.name == 'osm_tags':
+                data['translated_tags'] = self.translated_tags
+        return data
+
 class OSMDetailedFacilitySearcher:
     """OpenStreetMap详细设施搜索工具"""
     
-    def __init__(self):
-        """初始化OSM搜索器"""
+    # 收集的多语言名称标签
+    _NAME_KEYS = ('name', 'name:zh', 'name:en', 'name:zh-Hans', 'name:zh-Hant')
+    # 主名称的取值优先级
+    _PRIMARY_NAME_ORDER = ('name:zh', 'name', 'ref')
+    
+    def __init__(self, cache_dir: Optional[str] = ".osm_cache", cache_ttl: int = CACHE_TTL_SECONDS):
+        """
+        初始化OSM搜索器
+        
+        Args:
+            cache_dir: Overpass响应缓存目录，为None时不使用缓存
+            cache_ttl: 缓存有效期（秒）
+        """
         self.overpass_url = "https://overpass-api.de/api/interpreter"
+        self.session = self._create_session()
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
         
         # 定义要搜索的设施类型及其OSM标签
         self.facility_types = {
@@ -238,8 +372,116 @@ class OSMDetailedFacilitySearcher:
             'suburb': '郊区',
             'neighbourhood': '街区'
         }
+        
+        # 预编译的Overpass查询：每次搜索只需填入坐标与半径
+        self._type_query_templates = {
+            facility_type: self._compile_query_template(config['queries'])
+            for facility_type, config in self.facility_types.items()
+        }
+        self._query_template = self._compile_query_template(
+            [query_template for config in self.facility_types.values() for query_template in config['queries']]
+        )
+        
+        # 翻译表中出现的全部词条（键名与取值共用一张表）
+        self._translatable_terms = frozenset(self.tag_translations)
+        
+        # 预解析查询模板，用于合并查询返回后按标签把元素分派到设施类型
+        self._matchers = self._build_query_matchers()
+        
+        # 按模板中首个 键=值 条件建立哈希索引：(键, 值) -> 候选匹配器列表
+        # 没有 键=值 条件的模板归入 None，对每个元素都要检查
+        self._tag_to_facility: Dict[Optional[Tuple[str, str]], List] = {}
+        for matcher in self._matchers:
+            primary = next(((key, value) for negate, key, value in matcher[2] if not negate and value), None)
+            self._tag_to_facility.setdefault(primary, []).append(matcher)
+        
+        # 响应预筛选用的字节串：各模板首个正向条件的取值（无取值时为键名），带引号
+        # 不依赖Overpass输出中冒号后是否有空格；误报只会导致正常解析，不会漏报
+        self._type_needles: Dict[str, frozenset] = {}
+        for facility_type, _, conditions in self._matchers:
+            needle = next((f'"{value or key}"'.encode('utf-8') for negate, key, value in conditions if not negate), None)
+            if needle:
+                self._type_needles[facility_type] = self._type_needles.get(facility_type, frozenset()) | {needle}
+        self._all_needles = frozenset().union(*self._type_needles.values())
     
-    def search_facilities_around_point(self, lat: float, lng: float, radius: int = 1000) -> Dict:
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        创建复用连接的会话，对Overpass限流/网关错误自动退避重试
+        
+        读超时不重试（read=0）：合并查询的超时为180秒，重发只会让单次搜索等待十几分钟、
+        并把最重的查询再压给已过载的服务器；超时后直接交给分类型回退查询
+        """
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            backoff_factor=1,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST'])
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept-Encoding': 'gzip',
+            'User-Agent': 'WeatherG/1.0'
+        })
+        return session
+    
+    def _build_query_matchers(self) -> List[Tuple[str, str, Tuple[Tuple[bool, str, Optional[str]], ...]]]:
+        """将查询模板解析为 (设施类型, 元素类型, 标签条件) 列表"""
+        matchers = []
+        for facility_type, config in self.facility_types.items():
+            for query_template in config['queries']:
+                match = _TEMPLATE_RE.match(query_template)
+                if not match:
+                    continue
+                osm_type, condition_str = match.groups()
+                conditions = tuple(
+                    (negate == '!', key, value or None)
+                    for negate, key, value in _CONDITION_RE.findall(condition_str)
+                )
+                matchers.append((facility_type, osm_type, conditions))
+        return matchers
+    
+    @staticmethod
+    def _tags_match(tags: Dict, conditions: Tuple[Tuple[bool, str, Optional[str]], ...]) -> bool:
+        """判断标签是否满足模板中的全部条件"""
+        for negate, key, value in conditions:
+            if negate:
+                if key in tags:
+                    return False
+            elif value is None:
+                if key not in tags:
+                    return False
+            elif tags.get(key) != value:
+                return False
+        return True
+    
+    def _match_facility_types(self, element: Dict) -> List[str]:
+        """找出元素所属的全部设施类型（与逐类型查询的结果一致）"""
+        tags = element.get('tags', {})
+        osm_type = element.get('type')
+        tag_index = self._tag_to_facility
+        matched = []
+        
+        # 只检查与元素标签命中索引的模板，单次遍历标签即可完成分派
+        candidate_groups = [tag_index[item] for item in tags.items() if item in tag_index]
+        if None in tag_index:
+            candidate_groups.append(tag_index[None])
+        
+        for candidates in candidate_groups:
+            for facility_type, template_type, conditions in candidates:
+                if (template_type == osm_type and facility_type not in matched
+                        and self._tags_match(tags, conditions)):
+                    matched.append(facility_type)
+        return matched
+    
+    def search_facilities_around_point(self, lat: float, lng: float, radius: int = 1000,
+                                       geometry_top_k: int = GEOMETRY_TOP_K) -> Dict:
         """
         搜索指定坐标周围的设施
         
@@ -247,6 +489,7 @@ class OSMDetailedFacilitySearcher:
             lat: 纬度
             lng: 经度  
             radius: 搜索半径（米），默认1000米
+            geometry_top_k: 每类设施补充完整几何信息的最近元素数量
             
         Returns:
             包含所有设施详细信息的字典
@@ -256,75 +499,182 @@ class OSMDetailedFacilitySearcher:
         
         print(f"🔍 详细搜索坐标 ({lat:.6f}, {lng:.6f}) 周围 {radius}米 范围内的设施...")
         print("=" * 80)
+        print(f"\n📡 合并查询 {len(self.facility_types)} 类设施 ({len(self._matchers)} 个查询条件)...")
+        
+        # 第一阶段：一次轻量请求（仅中心点+标签）取回所有设施类型的元素，再按标签分派到各类型
+        elements = self._fetch_elements(self._build_overpass_query(lat, lng, radius), self._all_needles)
+        if elements is None:
+            print(f"   🔁 合并查询失败，改为按设施类型并发查询 (并发数 {MAX_CONCURRENT_QUERIES})...")
+            elements = self._fetch_elements_by_type(lat, lng, radius)
+        
+        # 一次性向量化计算所有元素到中心点的距离
+        distances = self._calculate_distances(lat, lng, elements)
+        
+        matched_by_type = {facility_type: [] for facility_type in self.facility_types}
+        for element, distance in zip(elements, distances.tolist()):
+            if math.isnan(distance):
+                # 无坐标的元素无法定位，也不参与按距离排序
+                continue
+            for facility_type in self._match_facility_types(element):
+                matched_by_type[facility_type].append((distance, element))
+        
+        # 第二阶段：只为每类最近的前K个way拉取完整几何
+        ways = {}
+        for matched in matched_by_type.values():
+            matched.sort(key=lambda item: item[0])
+            ways.update((e['id'], e) for _, e in matched[:geometry_top_k] if e.get('type') == 'way')
+        self._attach_way_geometry(ways)
         
         for facility_type, config in self.facility_types.items():
-            print(f"\n{config['icon']} 正在搜索 {facility_type} ({config['category']})...")
-            
-            facilities = self._search_single_facility_type(lat, lng, radius, facility_type, config, search_center)
+            # 去重在解析之前完成：重复元素不再做完整解析；列表已按距离排序
+            seen = set()
+            facilities = []
+            for distance, element in matched_by_type[facility_type]:
+                key = (element.get('type'), element.get('id'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                facility_info = self._parse_element_detailed(element, facility_type, config, search_center, distance)
+                if facility_info:
+                    facilities.append(facility_info)
             
             if facilities:
                 results[facility_type] = facilities
-                print(f"   ✅ 找到 {len(facilities)} 个{facility_type}")
+                print(f"{config['icon']} {facility_type} ({config['category']}): ✅ 找到 {len(facilities)} 个")
             else:
-                print(f"   ❌ 未找到{facility_type}")
-                
-            # 避免请求过于频繁
-            time.sleep(0.3)
+                print(f"{config['icon']} {facility_type} ({config['category']}): ❌ 未找到")
         
         return results
     
-    def _search_single_facility_type(self, lat: float, lng: float, radius: int, 
-                                   facility_type: str, config: Dict, search_center: Tuple[float, float]) -> List[Dict]:
-        """搜索单一类型的设施"""
-        all_facilities = []
-        
-        for query_template in config['queries']:
-            try:
-                # 构建更详细的Overpass查询，包含几何信息
-                overpass_query = f"""
-                [out:json][timeout:45];
-                (
-                  {query_template}(around:{radius},{lat},{lng});
-                );
-                out center meta geom;
-                """
+    def _attach_way_geometry(self, ways: Dict[int, Dict]) -> None:
+        """用一次union查询取回指定way的节点几何，并写回对应元素"""
+        if not ways:
+            return
+        
+        print(f"   📐 补充 {len(ways)} 个区域设施的几何信息...")
+        id_list = ",".join(str(way_id) for way_id in sorted(ways))
+        geometry_elements = self._fetch_elements(f"[out:json][timeout:45];\nway(id:{id_list});\nout geom;")
+        for geometry_element in geometry_elements or []:
+            way = ways.get(geometry_element.get('id'))
+            if way is not None and 'geometry' in geometry_element:
+                way['geometry'] = geometry_element['geometry']
+    
+    @staticmethod
+    def _compile_query_template(query_templates: List[str]) -> str:
+        """把一组查询模板预先拼成完整的union查询，坐标与半径留作占位符"""
+        lines = [f"  {query_template}(around:{{radius}},{{lat}},{{lng}});" for query_template in query_templates]
+        return "[out:json][timeout:180];\n(\n" + "\n".join(lines) + "\n);\nout center meta;"
+    
+    def _build_overpass_query(self, lat: float, lng: float, radius: int,
+                              facility_type: Optional[str] = None) -> str:
+        """填充预编译的查询模板：默认为全部设施类型的合并查询，也可指定单个类型"""
+        template = self._query_template if facility_type is None else self._type_query_templates[facility_type]
+        return template.format(lat=lat, lng=lng, radius=radius)
+    
+    def _fetch_elements_by_type(self, lat: float, lng: float, radius: int) -> List[Dict]:
+        """合并查询超时等失败时，按设施类型拆分查询并以有限并发执行"""
+        queries = [
+            self._build_overpass_query(lat, lng, radius, facility_type)
+            for facility_type in self.facility_types
+        ]
+        needles = [self._type_needles.get(facility_type) for facility_type in self.facility_types]
+        
+        # 不同类型的查询可能返回同一元素，按 (类型, ID) 合并，与union查询结果保持一致
+        elements = {}
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUERIES) as executor:
+            for type_elements in executor.map(self._fetch_elements, queries, needles):
+                for element in type_elements or []:
+                    elements.setdefault((element.get('type'), element.get('id')), element)
+        return list(elements.values())
+    
+    def _cache_path(self, overpass_query: str) -> Optional[str]:
+        """查询语句对应的缓存文件路径（按查询内容的SHA1命名）"""
+        if not self.cache_dir:
+            return None
+        key = hashlib.sha1(overpass_query.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _load_cached_elements(self, cache_path: Optional[str]) -> Optional[List[Dict]]:
+        """读取未过期的缓存，不存在或已过期时返回None"""
+        if not cache_path:
+            return None
+        try:
+            if time.time() - os.path.getmtime(cache_path) > self.cache_ttl:
+                return None
+            with open(cache_path, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached_elements(self, cache_path: Optional[str], elements: List[Dict]):
+        """写入缓存，失败时忽略（缓存仅用于加速）"""
+        if not cache_path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            if ORJSON_AVAILABLE:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(elements))
+            else:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(elements, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"   ⚠️  写入缓存失败: {e}")
+    
+    def _fetch_elements(self, overpass_query: str, needles: Optional[frozenset] = None) -> Optional[List[Dict]]:
+        """
+        发送Overpass查询并返回元素列表（优先使用磁盘缓存），失败时返回None
+        
+        Args:
+            overpass_query: Overpass查询语句
+            needles: 可选的预筛选字节串；响应中一个都不包含时说明没有匹配元素，跳过JSON解析
+        """
+        cache_path = self._cache_path(overpass_query)
+        cached = self._load_cached_elements(cache_path)
+        if cached is not None:
+            print(f"   💾 使用缓存结果 ({len(cached)} 个元素)")
+            return cached
+        
+        try:
+            response = self.session.post(
+                self.overpass_url,
+                data={'data': overpass_query},
+                timeout=180
+            )
+            
+            if response.status_code == 200:
+                content = response.content
+                # 超时/内存超限时Overpass仍返回200，结果不完整并在remark中说明，按失败处理且不缓存
+                if b'"remark"' in content and b'runtime error' in content:
+                    data = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+                    print(f"   ⚠️  查询失败: {data.get('remark', 'runtime error')}")
+                    return None
                 
-                response = requests.post(
-                    self.overpass_url,
-                    data={'data': overpass_query},
-                    timeout=45
-                )
+                if needles and not any(needle in content for needle in needles):
+                    self._save_cached_elements(cache_path, [])
+                    return []
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    elements = data.get('elements', [])
-                    
-                    for element in elements:
-                        facility_info = self._parse_element_detailed(element, facility_type, config, search_center)
-                        if facility_info:
-                            all_facilities.append(facility_info)
-                            
-                else:
-                    print(f"   ⚠️  查询失败: HTTP {response.status_code}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"   ⚠️  网络请求异常: {e}")
-            except Exception as e:
-                print(f"   ⚠️  查询异常: {e}")
-        
-        # 去重并按距离排序
-        unique_facilities = {}
-        for facility in all_facilities:
-            facility_id = facility['osm_id']
-            if facility_id not in unique_facilities:
-                unique_facilities[facility_id] = facility
-        
-        # 按距离排序
-        sorted_facilities = sorted(unique_facilities.values(), key=lambda x: x['distance'])
-        return sorted_facilities
-    
-    def _parse_element_detailed(self, element: Dict, facility_type: str, config: Dict, search_center: Tuple[float, float]) -> Optional[Dict]:
-        """详细解析OSM元素"""
+                # orjson直接解析响应字节，省去一次UTF-8解码
+                data = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+                elements = data.get('elements', [])
+                self._save_cached_elements(cache_path, elements)
+                return elements
+            
+            print(f"   ⚠️  查询失败: HTTP {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            print(f"   ⚠️  网络请求异常: {e}")
+        except Exception as e:
+            print(f"   ⚠️  查询异常: {e}")
+        
+        return None
+    
+    def _parse_element_detailed(self, element: Dict, facility_type: str, config: Dict, search_center: Tuple[float, float],
+                                distance: Optional[float] = None) -> Optional[Facility]:
+        """详细解析OSM元素（distance为预先批量计算的距离，缺省时单独计算）"""
         try:
             # 获取坐标
             if 'lat' in element and 'lon' in element:
@@ -335,22 +685,19 @@ class OSMDetailedFacilitySearcher:
                 return None
             
             # 计算距离
-            distance = self._calculate_distance(search_center[0], search_center[1], lat, lng)
+            if distance is None or math.isnan(distance):
+                distance = self._calculate_distance(search_center[0], search_center[1], lat, lng)
             
             # 获取标签
             tags = element.get('tags', {})
             
             # 获取名称（多种语言）
-            names = {}
-            name_keys = ['name', 'name:zh', 'name:en', 'name:zh-Hans', 'name:zh-Hant']
-            for key in name_keys:
-                if key in tags:
-                    names[key] = tags[key]
+            names = {key: tags[key] for key in self._NAME_KEYS if key in tags}
             
-            primary_name = (tags.get('name:zh') or 
-                           tags.get('name') or 
-                           tags.get('ref') or
-                           f"{facility_type}_{element['id']}")
+            primary_name = next(
+                (tags[key] for key in self._PRIMARY_NAME_ORDER if tags.get(key)),
+                f"{facility_type}_{element['id']}"
+            )
             
             # 获取几何信息
             geometry_info = self._extract_geometry_info(element)
@@ -364,58 +711,69 @@ class OSMDetailedFacilitySearcher:
             # 获取详细属性
             detailed_attributes = self._extract_detailed_attributes(tags, facility_type)
             
-            # 翻译标签
-            translated_tags = self._translate_tags(tags)
-            
-            return {
+            return Facility(
                 # 基本信息
-                'osm_id': f"{element['type']}_{element['id']}",
-                'osm_type': element['type'],
-                'osm_internal_id': element['id'],
-                'facility_type': facility_type,
-                'category': config['category'],
-                'icon': config['icon'],
-                'color': config['color'],
+                osm_id=f"{element['type']}_{element['id']}",
+                osm_type=element['type'],
+                osm_internal_id=element['id'],
+                facility_type=facility_type,
+                category=config['category'],
+                icon=config['icon'],
+                color=config['color'],
                 
                 # 名称信息
-                'primary_name': primary_name,
-                'names': names,
+                primary_name=primary_name,
+                names=names,
                 
                 # 位置信息
-                'coordinates': {
+                coordinates={
                     'lat': lat,
                     'lng': lng,
                     'formatted': f"{lat:.6f}, {lng:.6f}"
                 },
-                'distance': distance,
-                'distance_formatted': f"{distance:.0f}米" if distance < 1000 else f"{distance/1000:.1f}公里",
-                
-                # 几何信息
-                'geometry': geometry_info,
+                distance=distance,
+                distance_formatted=f"{distance:.0f}米" if distance < 1000 else f"{distance/1000:.1f}公里",
                 
-                # 联系信息
-                'contact': contact_info,
+                geometry=geometry_info,
+                contact=contact_info,
+                time_info=time_info,
+                attributes=detailed_attributes,
                 
-                # 时间信息
-                'time_info': time_info,
-                
-                # 详细属性
-                'attributes': detailed_attributes,
-                
-                # 原始OSM标签
-                'osm_tags': tags,
-                'translated_tags': translated_tags,
+                # 原始OSM标签（翻译在首次访问translated_tags时进行）
+                osm_tags=tags,
                 
                 # 元数据
-                'last_modified': element.get('timestamp', '未知'),
-                'version': element.get('version', '未知'),
-                'changeset': element.get('changeset', '未知')
-            }
+                last_modified=element.get('timestamp', '未知'),
+                version=element.get('version', '未知'),
+                changeset=element.get('changeset', '未知'),
+                
+                _translator=self._translate_tags
+            )
             
         except Exception as e:
             print(f"   ⚠️  解析元素失败: {e}")
             return None
     
+    @staticmethod
+    def _calculate_distances(lat0: float, lng0: float, elements: List[Dict]) -> np.ndarray:
+        """向量化计算所有元素到中心点的距离（米），无坐标的元素为NaN"""
+        def element_coords(element):
+            if 'lat' in element and 'lon' in element:
+                return element['lat'], element['lon']
+            center = element.get('center')
+            if center:
+                return center['lat'], center['lon']
+            return math.nan, math.nan
+        
+        coords = np.array([element_coords(e) for e in elements], dtype=np.float64).reshape(-1, 2)
+        lats = np.radians(coords[:, 0])
+        lngs = np.radians(coords[:, 1])
+        lat0_rad = math.radians(lat0)
+        
+        a = (np.sin((lats - lat0_rad) / 2) ** 2 +
+             math.cos(lat0_rad) * np.cos(lats) * np.sin((lngs - math.radians(lng0)) / 2) ** 2)
+        return 2 * 6371000 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
     def _calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
         """计算两点间距离（米）"""
         R = 6371000  # 地球半径（米）
@@ -444,54 +802,26 @@ class OSMDetailedFacilitySearcher:
             if geometry:
                 geometry_info['point_count'] = len(geometry)
                 
-                # 计算边界框
-                lats = [point['lat'] for point in geometry if 'lat' in point]
-                lngs = [point['lon'] for point in geometry if 'lon' in point]
+                # 坐标一次性提取为数组，供边界框与面积计算共用
+                lats = np.fromiter((point['lat'] for point in geometry if 'lat' in point), dtype=np.float64)
+                lngs = np.fromiter((point['lon'] for point in geometry if 'lon' in point), dtype=np.float64)
                 
-                if lats and lngs:
+                if lats.size and lngs.size:
                     geometry_info['bounds'] = {
-                        'north': max(lats),
-                        'south': min(lats),
-                        'east': max(lngs),
-                        'west': min(lngs)
+                        'north': float(lats.max()),
+                        'south': float(lats.min()),
+                        'east': float(lngs.max()),
+                        'west': float(lngs.min())
                     }
                     
                     # 估算面积（对于way和relation）
-                    if element['type'] in ['way', 'relation'] and len(geometry) > 2:
-                        area = self._calculate_polygon_area(geometry)
+                    if element['type'] in ['way', 'relation'] and lats.size > 2 and lats.size == lngs.size:
+                        area = _poly_area_m2(lats, lngs)
                         geometry_info['estimated_area'] = area
                         geometry_info['area_formatted'] = self._format_area(area)
         
         return geometry_info
     
-    def _calculate_polygon_area(self, geometry: List[Dict]) -> float:
-        """计算多边形面积（平方米）"""
-        if len(geometry) < 3:
-            return 0
-        
-        # 使用Shoelace公式计算面积
-        area = 0
-        n = len(geometry)
-        
-        for i in range(n):
-            j = (i + 1) % n
-            lat1, lng1 = geometry[i]['lat'], geometry[i]['lon']
-            lat2, lng2 = geometry[j]['lat'], geometry[j]['lon']
-            
-            # 转换为墨卡托投影坐标进行面积计算
-            x1, y1 = self._lat_lng_to_meters(lat1, lng1)
-            x2, y2 = self._lat_lng_to_meters(lat2, lng2)
-            
-            area += x1 * y2 - x2 * y1
-        
-        return abs(area) / 2
-    
-    def _lat_lng_to_meters(self, lat: float, lng: float) -> Tuple[float, float]:
-        """将经纬度转换为墨卡托投影米制坐标"""
-        x = lng * 111320 * math.cos(math.radians(lat))
-        y = lat * 110540
-        return x, y
-    
     def _format_area(self, area: float) -> str:
         """格式化面积显示"""
         if area < 1000:
@@ -582,18 +912,13 @@ class OSMDetailedFacilitySearcher:
     
     def _translate_tags(self, tags: Dict) -> Dict:
         """翻译OSM标签为中文"""
-        translated = {}
-        
-        for key, value in tags.items():
-            # 翻译键名
-            translated_key = self.tag_translations.get(key, key)
-            
-            # 翻译值
-            translated_value = self.tag_translations.get(value, value)
-            
-            translated[translated_key] = translated_value
+        # 键和值都不在翻译表中时（冷门标签的常见情况）直接复制，跳过逐项查表
+        translatable = self._translatable_terms
+        if translatable.isdisjoint(tags) and translatable.isdisjoint(tags.values()):
+            return dict(tags)
         
-        return translated
+        tget = self.tag_translations.get
+        return {tget(key, key): tget(value, value) for key, value in tags.items()}
     
     def print_detailed_results(self, results: Dict, search_center: Tuple[float, float]):
         """详细打印搜索结果"""
@@ -619,89 +944,101 @@ class OSMDetailedFacilitySearcher:
             print(f"{config['icon']} {facility_type} ({config['category']}) - {len(facilities)}个")
             print("=" * 80)
             
-            for i, facility in enumerate(facilities, 1):
-                self._print_single_facility(facility, i)
-                print("-" * 80)
-    
-    def _print_single_facility(self, facility: Dict, index: int):
-        """打印单个设施的详细信息"""
-        print(f"📍 {index}. {facility['primary_name']}")
-        print(f"   🏷️  类型: {facility['facility_type']} ({facility['category']})")
-        print(f"   📍 坐标: {facility['coordinates']['formatted']}")
-        print(f"   📏 距离: {facility['distance_formatted']}")
-        print(f"   🆔 OSM: {facility['osm_type']}/{facility['osm_internal_id']}")
+            # 整个类别的设施信息拼成一段文本后一次写出
+            separator = "\n" + "-" * 80 + "\n"
+            sys.stdout.write(separator.join(
+                self._render_single_facility(facility, i) for i, facility in enumerate(facilities, 1)
+            ) + separator)
+    
+    def _render_single_facility(self, facility: Facility, index: int) -> str:
+        """生成单个设施的详细信息文本"""
+        lines = []
+        append = lines.append
+        append(f"📍 {index}. {facility.primary_name}")
+        append(f"   🏷️  类型: {facility.facility_type} ({facility.category})")
+        append(f"   📍 坐标: {facility.coordinates['formatted']}")
+        append(f"   📏 距离: {facility.distance_formatted}")
+        append(f"   🆔 OSM: {facility.osm_type}/{facility.osm_internal_id}")
         
         # 多语言名称
-        if len(facility['names']) > 1:
-            print(f"   🌐 名称信息:")
-            for name_type, name_value in facility['names'].items():
-                print(f"      {name_type}: {name_value}")
+        if len(facility.names) > 1:
+            append(f"   🌐 名称信息:")
+            for name_type, name_value in facility.names.items():
+                append(f"      {name_type}: {name_value}")
         
         # 几何信息
-        geometry = facility['geometry']
+        geometry = facility.geometry
         if geometry['has_geometry']:
-            print(f"   📐 几何信息:")
-            print(f"      类型: {geometry['type']}")
+            append(f"   📐 几何信息:")
+            append(f"      类型: {geometry['type']}")
             if 'point_count' in geometry:
-                print(f"      节点数: {geometry['point_count']}")
+                append(f"      节点数: {geometry['point_count']}")
             if 'estimated_area' in geometry:
-                print(f"      估算面积: {geometry['area_formatted']}")
+                append(f"      估算面积: {geometry['area_formatted']}")
             if 'bounds' in geometry:
                 bounds = geometry['bounds']
-                print(f"      边界: N{bounds['north']:.6f} S{bounds['south']:.6f} E{bounds['east']:.6f} W{bounds['west']:.6f}")
+                append(f"      边界: N{bounds['north']:.6f} S{bounds['south']:.6f} E{bounds['east']:.6f} W{bounds['west']:.6f}")
         
         # 联系信息
-        if facility['contact']:
-            print(f"   📞 联系信息:")
-            for contact_type, contact_value in facility['contact'].items():
+        if facility.contact:
+            append(f"   📞 联系信息:")
+            for contact_type, contact_value in facility.contact.items():
                 if contact_type == 'formatted_address':
-                    print(f"      地址: {contact_value}")
+                    append(f"      地址: {contact_value}")
                 elif 'phone' in contact_type:
-                    print(f"      电话: {contact_value}")
+                    append(f"      电话: {contact_value}")
                 elif 'website' in contact_type or contact_type == 'url':
-                    print(f"      网站: {contact_value}")
+                    append(f"      网站: {contact_value}")
                 elif 'email' in contact_type:
-                    print(f"      邮箱: {contact_value}")
+                    append(f"      邮箱: {contact_value}")
         
         # 时间信息
-        if facility['time_info']:
-            print(f"   ⏰ 时间信息:")
-            for time_type, time_value in facility['time_info'].items():
+        if facility.time_info:
+            append(f"   ⏰ 时间信息:")
+            for time_type, time_value in facility.time_info.items():
                 if time_type == 'opening_hours':
-                    print(f"      开放时间: {time_value}")
+                    append(f"      开放时间: {time_value}")
                 else:
-                    print(f"      {time_type}: {time_value}")
+                    append(f"      {time_type}: {time_value}")
         
         # 详细属性
-        if facility['attributes']:
-            print(f"   🏷️  详细属性:")
-            for attr_key, attr_value in facility['attributes'].items():
-                print(f"      {attr_key}: {attr_value}")
+        if facility.attributes:
+            append(f"   🏷️  详细属性:")
+            for attr_key, attr_value in facility.attributes.items():
+                append(f"      {attr_key}: {attr_value}")
         
         # 翻译后的标签（只显示重要的）
         important_translated_tags = {}
-        for key, value in facility['translated_tags'].items():
+        for key, value in facility.translated_tags.items():
             if key in ['名称', '土地利用', '自然地物', '便民设施', '人造设施', '水道', '建筑物', '休闲设施']:
                 important_translated_tags[key] = value
         
         if important_translated_tags:
-            print(f"   🏷️  主要标签:")
+            append(f"   🏷️  主要标签:")
             for tag_key, tag_value in important_translated_tags.items():
-                print(f"      {tag_key}: {tag_value}")
+                append(f"      {tag_key}: {tag_value}")
         
         # 元数据
-        print(f"   📊 数据信息:")
-        print(f"      最后修改: {facility['last_modified']}")
-        print(f"      版本: {facility['version']}")
-        print(f"      变更集: {facility['changeset']}")
+        append(f"   📊 数据信息:")
+        append(f"      最后修改: {facility.last_modified}")
+        append(f"      版本: {facility.version}")
+        append(f"      变更集: {facility.changeset}")
+        
+        return "\n".join(lines)
     
-    def export_detailed_results(self, results: Dict, search_center: Tuple[float, float], filename: str = None):
-        """导出详细结果到JSON文件"""
+    def export_detailed_results(self, results: Dict, search_center: Tuple[float, float], filename: str = None,
+                                indent: bool = True):
+        """
+        导出详细结果到JSON文件
+        
+        Args:
+            indent: 是否缩进输出；为False时各段紧凑输出，文件更小、写出更快
+        """
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"osm_detailed_facilities_{timestamp}.json"
         
-        export_data = {
+        header = {
             'search_info': {
                 'search_time': datetime.now().isoformat(),
                 'search_center': {
@@ -715,18 +1052,44 @@ class OSMDetailedFacilitySearcher:
             'statistics': {
                 'by_type': {facility_type: len(facilities) for facility_type, facilities in results.items()},
                 'by_category': self._get_category_statistics(results)
-            },
-            'results': results
+            }
         }
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2)
+            # 分段流式写出：逐个设施类型序列化，不在内存中拼出整份缩进后的JSON
+            with open(filename, 'wb') as f:
+                f.write(b'{\n')
+                for key, value in header.items():
+                    f.write(b'  ' + self._dumps(key) + b': ' + self._dumps(value, indent, level=1) + b',\n')
+                f.write(b'  "results": {')
+                for i, (facility_type, facilities) in enumerate(results.items()):
+                    f.write(b',\n    ' if i else b'\n    ')
+                    f.write(self._dumps(facility_type) + b': ' +
+                            self._dumps([facility.to_dict() for facility in facilities], indent, level=2))
+                f.write(b'\n  }\n}\n' if results else b'}\n}\n')
             print(f"✅ 详细结果已导出到: {filename}")
             print(f"📊 文件大小: {self._get_file_size(filename)}")
         except Exception as e:
             print(f"❌ 导出失败: {e}")
     
+    @staticmethod
+    def _dumps(obj, indent: bool = False, level: int = 0) -> bytes:
+        """
+        序列化为UTF-8编码的JSON字节（优先使用orjson）
+        
+        indent为True时按2空格缩进，并为续行补上所在嵌套层级（level）的缩进，
+        分段写出的结果与整份缩进序列化一致
+        """
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            data = orjson.dumps(obj, option=option)
+        else:
+            data = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+        if indent and level:
+            # 字符串中的换行已转义为\n，这里只会替换结构上的换行
+            data = data.replace(b'\n', b'\n' + b'  ' * level)
+        return data
+    
     def _get_category_statistics(self, results: Dict) -> Dict:
         """获取分类统计"""
         category_stats = {}
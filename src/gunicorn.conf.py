@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+天气植被参数综合服务的gunicorn配置
+
+启动方式（在src目录下）：
+    gunicorn -c gunicorn.conf.py weather_vegetation_service:app
+
+服务以等待Open-Meteo和GEE响应为主，使用多进程 + 多线程(gthread)并发处理请求
+"""
+
+bind = '0.0.0.0:8081'
+
+# 进程数 × 线程数 = 可同时处理的请求数
+workers = 4
+worker_class = 'gthread'
+threads = 16
+
+# GEE查询可能需要数十秒，放宽超时以免worker被误杀
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+def post_fork(server, worker):
+    """每个worker启动后初始化GEE并预热连接，避免首个用户请求承担认证和建连耗时"""
+    from weather_vegetation_service import init_earth_engine
+    try:
+        init_earth_engine(warmup=True)
+        server.log.info("worker %s: Google Earth Engine 初始化完成", worker.pid)
+    except Exception as e:
+        # 失败时不阻止worker启动，首次查询时会再次尝试初始化
+        server.log.warning("worker %s: Google Earth Engine 初始化失败: %s", worker.pid, e)
@@ -11,19 +11,206 @@
 import ee
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime, timedelta
 import math
+import time
+import copy
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+import numpy as np
 
-# 初始化Google Earth Engine
-ee.Initialize(project='groovy-root-462406-i4')
+# orjson为可选依赖：未安装时使用标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Flask-Compress为可选依赖：未安装时响应不压缩
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+# Google Earth Engine配置
+# 使用高并发（high-volume）端点：服务端并发请求与每次查询的多数据集并发不会被串行排队
+GEE_PROJECT = 'groovy-root-462406-i4'
+GEE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+
+_EE_INIT_LOCK = threading.Lock()
+_ee_initialized = False
+
+def init_earth_engine(warmup=False):
+    """
+    初始化Google Earth Engine（幂等、线程安全）
+    
+    不在导入时初始化：gunicorn下由post_fork钩子在每个worker中调用并预热，
+    开发服务器下在首次查询时初始化
+    
+    Args:
+        warmup: 初始化后执行一次简单计算，提前完成认证和建连
+    """
+    global _ee_initialized
+    if _ee_initialized:
+        return
+    with _EE_INIT_LOCK:
+        if _ee_initialized:
+            return
+        ee.Initialize(project=GEE_PROJECT, opt_url=GEE_HIGH_VOLUME_URL)
+        if warmup:
+            ee.Number(1).getInfo()
+        _ee_initialized = True
+
+class OrjsonProvider(DefaultJSONProvider):
+    """使用orjson处理Flask的JSON请求解析与响应序列化（jsonify / request.json）"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# 响应压缩（客户端支持时优先brotli，否则gzip）：植被结果中重复的键名和中文说明压缩率很高，小响应不压缩
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_LEVEL'] = 5
+    Compress(app)
+
+@app.after_request
+def add_etag(response):
+    """
+    /api/simple的成功响应附带ETag；客户端携带If-None-Match且内容未变时直接返回304
+    
+    /api/status和/health的响应带有时间戳，每次内容都不同，计算ETag没有意义，因此只对/api/simple启用。
+    在Compress之后注册，因此先于压缩执行，ETag基于未压缩的内容
+    """
+    if (request.method == 'GET' and request.path == '/api/simple' and response.status_code == 200
+            and response.mimetype == 'application/json' and not response.direct_passthrough):
+        response.add_etag()
+        response.make_conditional(request)
+    return response
 
 # Open-Meteo API配置（完全免费，无需API密钥）
 WEATHER_API_KEY = None  # Open-Meteo不需要API密钥
 WEATHER_BASE_URL = "https://api.open-meteo.com/v1"
 
+# Open-Meteo天气代码（WMO）对应的中文描述
+_WEATHER_DESCRIPTIONS = {
+    0: '晴朗', 1: '主要晴朗', 2: '部分多云', 3: '阴天',
+    45: '雾', 48: '霜雾', 51: '小雨', 53: '中雨', 55: '大雨',
+    56: '冻小雨', 57: '冻中雨', 61: '小雨', 63: '中雨', 65: '大雨',
+    66: '冻雨', 67: '强冻雨', 71: '小雪', 73: '中雪', 75: '大雪',
+    77: '雪粒', 80: '小阵雨', 81: '中阵雨', 82: '大阵雨',
+    85: '小阵雪', 86: '大阵雪', 95: '雷暴', 96: '小冰雹雷暴', 99: '大冰雹雷暴'
+}
+
+# 植被与环境参数说明（随结果一起返回）
+_PARAMETER_DESCRIPTIONS = {
+    'LAI': '叶面积指数 (m²/m²)',
+    'FAPAR': '光合有效辐射吸收率 (0-1)',
+    'FVC': '植被覆盖度 (0-1)',
+    'Albedo': '宽带反照率 (0-1)',
+    'BBE': '宽带发射率 (0-1)',
+    'DSR': '向下短波辐射 (W/m²)',
+    'PAR': '光合有效辐射 (W/m²)',
+    'LST_Day': '白天地表温度 (°C)',
+    'LST_Night': '夜间地表温度 (°C)',
+    'ET': '蒸散发 (kg/m²/8day)',
+    'GPP': '总初级生产力 (kg C/m²/8day)',
+    'Snow_Cover': '积雪覆盖 (0-100%)',
+    'AGB': '地上生物量估算 (g/m²)',
+    'NDVI': '归一化植被指数 (-1 to 1)',
+    'EVI': '增强植被指数 (-1 to 1)',
+    'SAVI': '土壤调节植被指数 (-1 to 1)'
+}
+
+# 定点量化的缩放因子：与各参数返回时保留的小数位一致，value = 整数 / 缩放因子
+_QUANTIZE_SCALES = {
+    'NDVI': 10000, 'EVI': 10000, 'SAVI': 10000, 'FVC': 10000,
+    'Albedo': 10000, 'BBE': 10000, 'GPP': 10000,
+    'LAI': 1000, 'FAPAR': 1000,
+    'DSR': 100, 'PAR': 100, 'LST_Day': 100, 'LST_Night': 100,
+    'ET': 100, 'AGB': 100
+}
+
+# 共享的HTTP会话：复用TCP/TLS连接，避免每次请求重新握手
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+# ACCEPT_ENCODING 仅包含urllib3能解码的编码（安装brotli后自动包含br）
+SESSION.headers.update({
+    'Connection': 'keep-alive',
+    'Accept-Encoding': ACCEPT_ENCODING
+})
+
+# 响应缓存：Open-Meteo约每小时更新，MODIS为日/8日合成产品
+# 坐标保留3位小数（约110米）作为缓存键
+_WEATHER_CACHE = TTLCache(maxsize=4096, ttl=3600)
+_VEGETATION_CACHE = TTLCache(maxsize=1024, ttl=21600)
+_CACHE_LOCK = threading.Lock()
+
+def _is_cacheable(result):
+    """只缓存完整成功的结果：出错、成功率为0或有数据集查询失败的结果不缓存"""
+    return ('error' not in result
+            and result.get('success_rate') != 0
+            and not result.get('dataset_errors'))
+
+def _ttl_cached(cache, key, localize=None):
+    """
+    为数据获取函数加TTL缓存
+    
+    缓存键对坐标取整，命中时返回缓存结果的深拷贝，并由localize写回本次请求自己的坐标等字段，
+    调用方修改返回值不会影响缓存
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            with _CACHE_LOCK:
+                cached = cache.get(cache_key)
+            if cached is None:
+                cached = func(*args, **kwargs)
+                if not _is_cacheable(cached):
+                    return cached
+                with _CACHE_LOCK:
+                    cache[cache_key] = cached
+            
+            result = copy.deepcopy(cached)
+            if localize is not None:
+                localize(result, *args, **kwargs)
+            return result
+        return wrapper
+    return decorator
+
+def _localize_weather(result, lat, lon):
+    """写回本次请求的坐标点名称"""
+    result['location']['name'] = f'坐标点 ({lat}, {lon})'
+
+def _localize_vegetation(result, lat, lon, days_back=30):
+    """写回本次请求的坐标"""
+    result['coordinates'] = {'latitude': lat, 'longitude': lon}
+
+@_ttl_cached(_WEATHER_CACHE, key=lambda lat, lon: (round(lat, 3), round(lon, 3)),
+             localize=_localize_weather)
 def get_weather_data(lat, lon):
     """
     获取天气数据 - 使用Open-Meteo免费API
@@ -42,28 +229,20 @@ def get_weather_data(lat, lon):
             'latitude': lat,
             'longitude': lon,
             'current': 'temperature_2m,relative_humidity_2m,pressure_msl,wind_speed_10m,wind_direction_10m,weather_code',
-            'timezone': 'auto',
-            'forecast_days': 1
+            'timezone': 'auto'
         }
         
-        current_response = requests.get(current_url, params=current_params, timeout=10)
+        current_response = SESSION.get(current_url, params=current_params, timeout=10)
         
         if current_response.status_code == 200:
-            data = current_response.json()
+            # 只请求了current块；orjson直接解析响应字节
+            content = current_response.content
+            data = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
             current = data['current']
             
             # 天气代码转换为描述
-            weather_descriptions = {
-                0: '晴朗', 1: '主要晴朗', 2: '部分多云', 3: '阴天',
-                45: '雾', 48: '霜雾', 51: '小雨', 53: '中雨', 55: '大雨',
-                56: '冻小雨', 57: '冻中雨', 61: '小雨', 63: '中雨', 65: '大雨',
-                66: '冻雨', 67: '强冻雨', 71: '小雪', 73: '中雪', 75: '大雪',
-                77: '雪粒', 80: '小阵雨', 81: '中阵雨', 82: '大阵雨',
-                85: '小阵雪', 86: '大阵雪', 95: '雷暴', 96: '小冰雹雷暴', 99: '大冰雹雷暴'
-            }
-            
             weather_code = current.get('weather_code', 0)
-            weather_desc = weather_descriptions.get(weather_code, '未知天气')
+            weather_desc = _WEATHER_DESCRIPTIONS.get(weather_code, '未知天气')
             
             return {
                 'current': {
@@ -88,6 +267,337 @@ def get_weather_data(lat, lon):
     except Exception as e:
         return {'error': f'天气数据获取失败: {str(e)}'}
 
+# 合并查询失败回退时，各数据集的并发查询线程数（GEE请求以网络等待为主）
+MAX_GEE_WORKERS = 8
+
+def compute_vegetation_indices(nir, red, blue):
+    """
+    由Sentinel-2波段（B8近红外、B4红、B2蓝）计算NDVI、EVI、SAVI
+    
+    输入可以是标量或同形状数组（如逐像元栅格），以float32整体向量化计算；
+    分母为0等无效位置返回NaN
+    """
+    nir = np.asarray(nir, dtype=np.float32)
+    red = np.asarray(red, dtype=np.float32)
+    blue = np.asarray(blue, dtype=np.float32)
+    
+    diff = nir - red
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indices = {
+            'NDVI': diff / (nir + red),
+            'EVI': 2.5 * (diff / (nir + 6 * red - 7.5 * blue + 1)),
+            'SAVI': (diff / (nir + red + 0.5)) * 1.5
+        }
+    return {name: np.where(np.isfinite(value), value, np.float32(np.nan)) for name, value in indices.items()}
+
+def _reduce_if_present(collection, reduce, composite='first'):
+    """
+    集合非空时对影像做归约，否则返回空字典
+    
+    composite='first' 使用最新一景影像；composite='mean' 先在服务端合成时间窗口内的均值影像，
+    结果更稳健且仍只需一次计算。存在性判断在服务端完成（ee.Algorithms.If），与取值合并为同一次getInfo
+    """
+    image = collection.mean() if composite == 'mean' else ee.Image(collection.first())
+    return ee.Dictionary(ee.Algorithms.If(
+        collection.size().gt(0),
+        reduce(image),
+        ee.Dictionary({})
+    ))
+
+def _build_sentinel2(point, start_str, end_str, buffers, mean_reducer):
+    """1-3. Sentinel-2 原始波段（B2/B4/B8），植被指数在本地计算"""
+    s2_sr = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
+             .filterBounds(point)
+             .filterDate(start_str, end_str)
+             .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
+             .sort('system:time_start', False))
+    
+    def sample_bands(s2_image):
+        # 像元被掩膜时采样结果为空，返回空字典而不是让整个合并查询失败
+        sample = s2_image.select(['B2', 'B4', 'B8']).sample(point, 10)
+        return ee.Dictionary(ee.Algorithms.If(
+            sample.size().gt(0),
+            ee.Feature(sample.first()).toDictionary(),
+            ee.Dictionary({})
+        ))
+    
+    return _reduce_if_present(s2_sr, sample_bands)
+
+def _parse_sentinel2(bands):
+    """NDVI/EVI/SAVI，并由NDVI估算FVC"""
+    result = {'sentinel2_data': {}, 'estimated_values': {}}
+    
+    ndvi_val = evi_val = savi_val = None
+    if all(bands.get(band) is not None for band in ('B2', 'B4', 'B8')):
+        indices = compute_vegetation_indices(bands['B8'], bands['B4'], bands['B2'])
+        ndvi_val, evi_val, savi_val = (
+            float(indices[name]) if np.isfinite(indices[name]) else None
+            for name in ('NDVI', 'EVI', 'SAVI')
+        )
+    
+    if ndvi_val is not None:
+        result['sentinel2_data']['NDVI'] = round(float(ndvi_val), 4)
+        # 使用NDVI估算FVC
+        if ndvi_val > 0:
+            fvc = ((ndvi_val - 0.05) / (0.95 - 0.05)) ** 2
+            result['estimated_values']['FVC'] = round(max(0, min(1, fvc)), 4)
+    
+    if evi_val is not None:
+        result['sentinel2_data']['EVI'] = round(float(evi_val), 4)
+    
+    if savi_val is not None:
+        result['sentinel2_data']['SAVI'] = round(float(savi_val), 4)
+    
+    return result
+
+def _build_modis_lai_fapar(point, start_str, end_str, buffers, mean_reducer):
+    """4-5. MODIS LAI/FAPAR"""
+    modis_lai = (ee.ImageCollection('MODIS/061/MCD15A3H')
+                 .filterBounds(point)
+                 .filterDate(start_str, end_str)
+                 .sort('system:time_start', False))
+    
+    # 使用缓冲区采样提高成功率；两个波段一次归约
+    return _reduce_if_present(modis_lai, lambda lai_image: lai_image.select(['Lai', 'Fpar']).reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[250],  # 250米缓冲区
+        scale=500,
+        maxPixels=1e9
+    ))
+
+def _parse_modis_lai_fapar(lai_fpar):
+    modis_data = {}
+    lai_val = lai_fpar.get('Lai')
+    fpar_val = lai_fpar.get('Fpar')
+    
+    if lai_val is not None and lai_val != 0:
+        # MODIS LAI缩放因子是0.1
+        modis_data['LAI'] = round(float(lai_val) * 0.1, 3)
+    
+    if fpar_val is not None and fpar_val != 0:
+        # MODIS FPAR缩放因子是0.01
+        modis_data['FAPAR'] = round(float(fpar_val) * 0.01, 3)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_albedo(point, start_str, end_str, buffers, mean_reducer):
+    """6. Albedo (反照率)"""
+    modis_albedo = (ee.ImageCollection('MODIS/061/MCD43A3')
+                   .filterBounds(point)
+                   .filterDate(start_str, end_str)
+                   .sort('system:time_start', False))
+    
+    # 获取shortwave白天反照率（时间窗口内均值合成）
+    return _reduce_if_present(modis_albedo, lambda albedo_image: albedo_image.select('Albedo_WSA_shortwave').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[250],
+        scale=500,
+        maxPixels=1e9
+    ), composite='mean')
+
+def _parse_modis_albedo(albedo_region):
+    modis_data = {}
+    albedo_val = albedo_region.get('Albedo_WSA_shortwave')
+    if albedo_val is not None:
+        # MODIS反照率缩放因子是0.001
+        modis_data['Albedo'] = round(float(albedo_val) * 0.001, 4)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_radiation(point, start_str, end_str, buffers, mean_reducer):
+    """7-8. DSR和PAR (辐射数据)"""
+    # MCD18A1: 向下短波辐射
+    modis_dsr = (ee.ImageCollection('MODIS/061/MCD18A1')
+                .filterBounds(point)
+                .filterDate(start_str, end_str)
+                .sort('system:time_start', False))
+    
+    # MCD18C2: 光合有效辐射 
+    modis_par = (ee.ImageCollection('MODIS/061/MCD18C2')
+                .filterBounds(point)
+                .filterDate(start_str, end_str)
+                .sort('system:time_start', False))
+    
+    # 两个产品分辨率不同，各自归约后合并为一个字典
+    dsr_region = _reduce_if_present(modis_dsr, lambda dsr_image: dsr_image.select('DSR').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[500],
+        scale=1000,
+        maxPixels=1e9
+    ))
+    
+    par_region = _reduce_if_present(modis_par, lambda par_image: par_image.select('PAR').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[2500],  # PAR是0.05度分辨率
+        scale=5600,
+        maxPixels=1e9
+    ))
+    
+    return dsr_region.combine(par_region)
+
+def _parse_modis_radiation(radiation_values):
+    modis_data = {}
+    dsr_val = radiation_values.get('DSR')
+    if dsr_val is not None:
+        modis_data['DSR'] = round(float(dsr_val), 2)
+    
+    par_val = radiation_values.get('PAR')
+    if par_val is not None:
+        modis_data['PAR'] = round(float(par_val), 2)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_lst(point, start_str, end_str, buffers, mean_reducer):
+    """9. LST (地表温度)"""
+    modis_lst = (ee.ImageCollection('MODIS/061/MOD11A1')
+                .filterBounds(point)
+                .filterDate(start_str, end_str)
+                .sort('system:time_start', False))
+    
+    # 白天与夜间波段一次归约（时间窗口内均值合成，减少云和缺测影响）
+    return _reduce_if_present(modis_lst, lambda lst_image: lst_image.select(['LST_Day_1km', 'LST_Night_1km']).reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[500],
+        scale=1000,
+        maxPixels=1e9
+    ), composite='mean')
+
+def _parse_modis_lst(lst_values):
+    modis_data = {}
+    lst_day_val = lst_values.get('LST_Day_1km')
+    lst_night_val = lst_values.get('LST_Night_1km')
+    
+    if lst_day_val is not None:
+        # MODIS LST缩放因子是0.02，单位是开尔文
+        lst_celsius = float(lst_day_val) * 0.02 - 273.15
+        modis_data['LST_Day'] = round(lst_celsius, 2)
+    
+    if lst_night_val is not None:
+        lst_celsius = float(lst_night_val) * 0.02 - 273.15
+        modis_data['LST_Night'] = round(lst_celsius, 2)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_et(point, start_str, end_str, buffers, mean_reducer):
+    """10. ET (蒸散发)"""
+    modis_et = (ee.ImageCollection('MODIS/061/MOD16A2')
+               .filterBounds(point)
+               .filterDate(start_str, end_str)
+               .sort('system:time_start', False))
+    
+    return _reduce_if_present(modis_et, lambda et_image: et_image.select('ET').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[250],
+        scale=500,
+        maxPixels=1e9
+    ), composite='mean')
+
+def _parse_modis_et(et_region):
+    modis_data = {}
+    et_val = et_region.get('ET')
+    if et_val is not None:
+        # MODIS ET缩放因子是0.1，单位是kg/m²/8day
+        modis_data['ET'] = round(float(et_val) * 0.1, 2)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_gpp(point, start_str, end_str, buffers, mean_reducer):
+    """11. GPP (总初级生产力)"""
+    modis_gpp = (ee.ImageCollection('MODIS/061/MOD17A2H')
+                .filterBounds(point)
+                .filterDate(start_str, end_str)
+                .sort('system:time_start', False))
+    
+    return _reduce_if_present(modis_gpp, lambda gpp_image: gpp_image.select('Gpp').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[250],
+        scale=500,
+        maxPixels=1e9
+    ), composite='mean')
+
+def _parse_modis_gpp(gpp_region):
+    modis_data = {}
+    gpp_val = gpp_region.get('Gpp')
+    if gpp_val is not None:
+        # MODIS GPP缩放因子是0.0001，单位是kg C/m²/8day
+        modis_data['GPP'] = round(float(gpp_val) * 0.0001, 4)
+    
+    return {'modis_data': modis_data}
+
+def _build_modis_snow(point, start_str, end_str, buffers, mean_reducer):
+    """12. SCE (积雪覆盖)"""
+    modis_snow = (ee.ImageCollection('MODIS/061/MOD10A1')
+                 .filterBounds(point)
+                 .filterDate(start_str, end_str)
+                 .sort('system:time_start', False))
+    
+    return _reduce_if_present(modis_snow, lambda snow_image: snow_image.select('NDSI_Snow_Cover').reduceRegion(
+        reducer=mean_reducer,
+        geometry=buffers[250],
+        scale=500,
+        maxPixels=1e9
+    ))
+
+def _parse_modis_snow(snow_region):
+    modis_data = {}
+    snow_val = snow_region.get('NDSI_Snow_Cover')
+    if snow_val is not None:
+        modis_data['Snow_Cover'] = int(snow_val)
+    
+    return {'modis_data': modis_data}
+
+# 各数据集：(结果键, 名称, 构建服务端计算, 解析结果)，按原有顺序合并结果
+VEGETATION_DATASETS = [
+    ('sentinel2', 'Sentinel-2', _build_sentinel2, _parse_sentinel2),
+    ('lai_fapar', 'MODIS LAI/FAPAR', _build_modis_lai_fapar, _parse_modis_lai_fapar),
+    ('albedo', 'MODIS Albedo', _build_modis_albedo, _parse_modis_albedo),
+    ('radiation', 'MODIS辐射', _build_modis_radiation, _parse_modis_radiation),
+    ('lst', 'MODIS LST', _build_modis_lst, _parse_modis_lst),
+    ('et', 'MODIS ET', _build_modis_et, _parse_modis_et),
+    ('gpp', 'MODIS GPP', _build_modis_gpp, _parse_modis_gpp),
+    ('snow', 'MODIS积雪', _build_modis_snow, _parse_modis_snow),
+]
+
+def _parse_dataset(label, parse, values):
+    """解析单个数据集的结果，失败只影响该数据集；无数据返回空字典，出错返回None"""
+    if not values:
+        return {}
+    try:
+        result = parse(values)
+        print(f"✅ {label}数据获取成功")
+        return result
+    except Exception as e:
+        print(f"⚠️  {label}数据获取失败: {str(e)}")
+        return None
+
+def _fetch_dataset(dataset, args):
+    """单独查询一个数据集（一次getInfo），用于合并查询失败时的回退；出错返回None"""
+    _, label, build, parse = dataset
+    try:
+        values = build(*args).getInfo()
+    except Exception as e:
+        print(f"⚠️  {label}数据获取失败: {str(e)}")
+        return None
+    return _parse_dataset(label, parse, values)
+
+def _fetch_all_datasets(args):
+    """
+    查询全部数据集，返回与 VEGETATION_DATASETS 顺序一致的结果列表，出错的数据集对应None
+    
+    所有数据集的服务端计算合并为一个ee.Dictionary，一次getInfo取回；
+    任一数据集导致整体计算失败时，回退为线程池逐个数据集并发查询
+    """
+    try:
+        batched = ee.Dictionary({key: build(*args) for key, _, build, _ in VEGETATION_DATASETS}).getInfo()
+    except Exception as e:
+        print(f"⚠️  合并查询失败，改为逐个数据集查询: {str(e)}")
+        with ThreadPoolExecutor(max_workers=MAX_GEE_WORKERS) as executor:
+            return list(executor.map(lambda dataset: _fetch_dataset(dataset, args), VEGETATION_DATASETS))
+    
+    return [_parse_dataset(label, parse, batched.get(key)) for key, label, _, parse in VEGETATION_DATASETS]
+
+@_ttl_cached(_VEGETATION_CACHE, key=lambda lat, lon, days_back=30: (round(lat, 3), round(lon, 3), days_back),
+             localize=_localize_vegetation)
 def get_vegetation_data(lat, lon, days_back=30):
     """
     获取植被和环境参数数据（扩展版）
@@ -107,9 +617,13 @@ def get_vegetation_data(lat, lon, days_back=30):
     12. AGB (地上生物量) ✓ (粗略估算)
     13. LWNR (净长波辐射) ✗ (需要复杂计算)
     14. NR (净辐射) ✗ (需要复杂计算)
+    
+    全部数据集合并为一次GEE计算取回；失败时回退为线程池逐个数据集并发查询
     """
     
     try:
+        init_earth_engine()
+        
         # 创建点几何和时间范围
         point = ee.Geometry.Point([lon, lat])
         end_date = datetime.now()
@@ -131,310 +645,19 @@ def get_vegetation_data(lat, lon, days_back=30):
             'data_quality': 'mixed'
         }
         
-        # === 1-3. Sentinel-2 数据：LAI, FAPAR, FVC ===
-        try:
-            s2_sr = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-                     .filterBounds(point)
-                     .filterDate(start_str, end_str)
-                     .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-                     .sort('system:time_start', False))
-            
-            if s2_sr.size().getInfo() > 0:
-                s2_image = s2_sr.first()
-                
-                # 计算植被指数
-                def calculate_ndvi(image):
-                    return image.normalizedDifference(['B8', 'B4']).rename('NDVI')
-                
-                def calculate_evi(image):
-                    evi = image.expression(
-                        '2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))',
-                        {
-                            'NIR': image.select('B8'),
-                            'RED': image.select('B4'),
-                            'BLUE': image.select('B2')
-                        }
-                    ).rename('EVI')
-                    return evi
-                
-                def calculate_savi(image):
-                    savi = image.expression(
-                        '((NIR - RED) / (NIR + RED + 0.5)) * 1.5',
-                        {
-                            'NIR': image.select('B8'),
-                            'RED': image.select('B4')
-                        }
-                    ).rename('SAVI')
-                    return savi
-                
-                # 计算指数
-                ndvi = calculate_ndvi(s2_image)
-                evi = calculate_evi(s2_image)
-                savi = calculate_savi(s2_image)
-                
-                # 采样数据
-                ndvi_sample = ndvi.sample(point, 10).first()
-                evi_sample = evi.sample(point, 10).first()
-                savi_sample = savi.sample(point, 10).first()
-                
-                ndvi_val = ndvi_sample.get('NDVI').getInfo() if ndvi_sample.get('NDVI') else None
-                evi_val = evi_sample.get('EVI').getInfo() if evi_sample.get('EVI') else None
-                savi_val = savi_sample.get('SAVI').getInfo() if savi_sample.get('SAVI') else None
-                
-                if ndvi_val is not None:
-                    vegetation_data['sentinel2_data']['NDVI'] = round(float(ndvi_val), 4)
-                    # 使用NDVI估算FVC
-                    if ndvi_val > 0:
-                        fvc = ((ndvi_val - 0.05) / (0.95 - 0.05)) ** 2
-                        vegetation_data['estimated_values']['FVC'] = round(max(0, min(1, fvc)), 4)
-                
-                if evi_val is not None:
-                    vegetation_data['sentinel2_data']['EVI'] = round(float(evi_val), 4)
-                
-                if savi_val is not None:
-                    vegetation_data['sentinel2_data']['SAVI'] = round(float(savi_val), 4)
-                
-                print(f"✅ Sentinel-2 数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  Sentinel-2 数据获取失败: {str(e)}")
-        
-        # === 4-5. MODIS LAI/FAPAR ===
-        try:
-            modis_lai = (ee.ImageCollection('MODIS/061/MCD15A3H')
-                         .filterBounds(point)
-                         .filterDate(start_str, end_str)
-                         .sort('system:time_start', False))
-            
-            if modis_lai.size().getInfo() > 0:
-                lai_image = modis_lai.first()
-                
-                # 使用缓冲区采样提高成功率
-                lai_region = lai_image.select('Lai').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),  # 250米缓冲区
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                fpar_region = lai_image.select('Fpar').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                lai_val = lai_region.get('Lai').getInfo()
-                fpar_val = fpar_region.get('Fpar').getInfo()
-                
-                if lai_val is not None and lai_val != 0:
-                    # MODIS LAI缩放因子是0.1
-                    vegetation_data['modis_data']['LAI'] = round(float(lai_val) * 0.1, 3)
-                
-                if fpar_val is not None and fpar_val != 0:
-                    # MODIS FPAR缩放因子是0.01
-                    vegetation_data['modis_data']['FAPAR'] = round(float(fpar_val) * 0.01, 3)
-                
-                print(f"✅ MODIS LAI/FAPAR数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS LAI/FAPAR数据获取失败: {str(e)}")
-        
-        # === 6. Albedo (反照率) ===
-        try:
-            modis_albedo = (ee.ImageCollection('MODIS/061/MCD43A3')
-                           .filterBounds(point)
-                           .filterDate(start_str, end_str)
-                           .sort('system:time_start', False))
-            
-            if modis_albedo.size().getInfo() > 0:
-                albedo_image = modis_albedo.first()
-                
-                # 获取shortwave白天反照率
-                albedo_region = albedo_image.select('Albedo_WSA_shortwave').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                albedo_val = albedo_region.get('Albedo_WSA_shortwave').getInfo()
-                if albedo_val is not None:
-                    # MODIS反照率缩放因子是0.001
-                    vegetation_data['modis_data']['Albedo'] = round(float(albedo_val) * 0.001, 4)
-                
-                print(f"✅ MODIS Albedo数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS Albedo数据获取失败: {str(e)}")
-        
-        # === 7-8. DSR和PAR (辐射数据) ===
-        try:
-            # MCD18A1: 向下短波辐射
-            modis_dsr = (ee.ImageCollection('MODIS/061/MCD18A1')
-                        .filterBounds(point)
-                        .filterDate(start_str, end_str)
-                        .sort('system:time_start', False))
-            
-            if modis_dsr.size().getInfo() > 0:
-                dsr_image = modis_dsr.first()
-                
-                dsr_region = dsr_image.select('DSR').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(500),
-                    scale=1000,
-                    maxPixels=1e9
-                )
-                
-                dsr_val = dsr_region.get('DSR').getInfo()
-                if dsr_val is not None:
-                    vegetation_data['modis_data']['DSR'] = round(float(dsr_val), 2)
-            
-            # MCD18C2: 光合有效辐射 
-            modis_par = (ee.ImageCollection('MODIS/061/MCD18C2')
-                        .filterBounds(point)
-                        .filterDate(start_str, end_str)
-                        .sort('system:time_start', False))
-            
-            if modis_par.size().getInfo() > 0:
-                par_image = modis_par.first()
-                
-                par_region = par_image.select('PAR').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(2500),  # PAR是0.05度分辨率
-                    scale=5600,
-                    maxPixels=1e9
-                )
-                
-                par_val = par_region.get('PAR').getInfo()
-                if par_val is not None:
-                    vegetation_data['modis_data']['PAR'] = round(float(par_val), 2)
-            
-            print(f"✅ MODIS辐射数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS辐射数据获取失败: {str(e)}")
-        
-        # === 9. LST (地表温度) ===
-        try:
-            modis_lst = (ee.ImageCollection('MODIS/061/MOD11A1')
-                        .filterBounds(point)
-                        .filterDate(start_str, end_str)
-                        .sort('system:time_start', False))
-            
-            if modis_lst.size().getInfo() > 0:
-                lst_image = modis_lst.first()
-                
-                lst_day_region = lst_image.select('LST_Day_1km').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(500),
-                    scale=1000,
-                    maxPixels=1e9
-                )
-                
-                lst_night_region = lst_image.select('LST_Night_1km').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(500),
-                    scale=1000,
-                    maxPixels=1e9
-                )
-                
-                lst_day_val = lst_day_region.get('LST_Day_1km').getInfo()
-                lst_night_val = lst_night_region.get('LST_Night_1km').getInfo()
-                
-                if lst_day_val is not None:
-                    # MODIS LST缩放因子是0.02，单位是开尔文
-                    lst_celsius = float(lst_day_val) * 0.02 - 273.15
-                    vegetation_data['modis_data']['LST_Day'] = round(lst_celsius, 2)
-                
-                if lst_night_val is not None:
-                    lst_celsius = float(lst_night_val) * 0.02 - 273.15
-                    vegetation_data['modis_data']['LST_Night'] = round(lst_celsius, 2)
-                
-                print(f"✅ MODIS LST数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS LST数据获取失败: {str(e)}")
-        
-        # === 10. ET (蒸散发) ===
-        try:
-            modis_et = (ee.ImageCollection('MODIS/061/MOD16A2')
-                       .filterBounds(point)
-                       .filterDate(start_str, end_str)
-                       .sort('system:time_start', False))
-            
-            if modis_et.size().getInfo() > 0:
-                et_image = modis_et.first()
-                
-                et_region = et_image.select('ET').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                et_val = et_region.get('ET').getInfo()
-                if et_val is not None:
-                    # MODIS ET缩放因子是0.1，单位是kg/m²/8day
-                    vegetation_data['modis_data']['ET'] = round(float(et_val) * 0.1, 2)
-                
-                print(f"✅ MODIS ET数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS ET数据获取失败: {str(e)}")
-        
-        # === 11. GPP (总初级生产力) ===
-        try:
-            modis_gpp = (ee.ImageCollection('MODIS/061/MOD17A2H')
-                        .filterBounds(point)
-                        .filterDate(start_str, end_str)
-                        .sort('system:time_start', False))
-            
-            if modis_gpp.size().getInfo() > 0:
-                gpp_image = modis_gpp.first()
-                
-                gpp_region = gpp_image.select('Gpp').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                gpp_val = gpp_region.get('Gpp').getInfo()
-                if gpp_val is not None:
-                    # MODIS GPP缩放因子是0.0001，单位是kg C/m²/8day
-                    vegetation_data['modis_data']['GPP'] = round(float(gpp_val) * 0.0001, 4)
-                
-                print(f"✅ MODIS GPP数据获取成功")
-        
-        except Exception as e:
-            print(f"⚠️  MODIS GPP数据获取失败: {str(e)}")
-        
-        # === 12. SCE (积雪覆盖) ===
-        try:
-            modis_snow = (ee.ImageCollection('MODIS/061/MOD10A1')
-                         .filterBounds(point)
-                         .filterDate(start_str, end_str)
-                         .sort('system:time_start', False))
-            
-            if modis_snow.size().getInfo() > 0:
-                snow_image = modis_snow.first()
-                
-                snow_region = snow_image.select('NDSI_Snow_Cover').reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=point.buffer(250),
-                    scale=500,
-                    maxPixels=1e9
-                )
-                
-                snow_val = snow_region.get('NDSI_Snow_Cover').getInfo()
-                if snow_val is not None:
-                    vegetation_data['modis_data']['Snow_Cover'] = int(snow_val)
-                
-                print(f"✅ MODIS积雪数据获取成功")
+        # 各数据集共用的采样缓冲区和归约器，只构建一次
+        buffers = {radius: point.buffer(radius) for radius in (250, 500, 2500)}
+        mean_reducer = ee.Reducer.mean()
         
-        except Exception as e:
-            print(f"⚠️  MODIS积雪数据获取失败: {str(e)}")
+        # === 1-12. 查询各数据集，按固定顺序合并以保持输出稳定 ===
+        results = _fetch_all_datasets((point, start_str, end_str, buffers, mean_reducer))
+        for (_, label, _, _), result in zip(VEGETATION_DATASETS, results):
+            if result is None:
+                # 记录出错的数据集，这样的结果不进入缓存
+                vegetation_data.setdefault('dataset_errors', []).append(label)
+                continue
+            for section, values in result.items():
+                vegetation_data[section].update(values)
         
         # === 13. BBE (宽带发射率) 和 AGB (生物量估算) ===
         try:
@@ -474,24 +697,7 @@ def get_vegetation_data(lat, lon, days_back=30):
         vegetation_data['success_rate'] = round(available_params / total_params * 100, 1)
         
         # 添加参数说明
-        vegetation_data['parameter_descriptions'] = {
-            'LAI': '叶面积指数 (m²/m²)',
-            'FAPAR': '光合有效辐射吸收率 (0-1)',
-            'FVC': '植被覆盖度 (0-1)',
-            'Albedo': '宽带反照率 (0-1)',
-            'BBE': '宽带发射率 (0-1)',
-            'DSR': '向下短波辐射 (W/m²)',
-            'PAR': '光合有效辐射 (W/m²)',
-            'LST_Day': '白天地表温度 (°C)',
-            'LST_Night': '夜间地表温度 (°C)',
-            'ET': '蒸散发 (kg/m²/8day)',
-            'GPP': '总初级生产力 (kg C/m²/8day)',
-            'Snow_Cover': '积雪覆盖 (0-100%)',
-            'AGB': '地上生物量估算 (g/m²)',
-            'NDVI': '归一化植被指数 (-1 to 1)',
-            'EVI': '增强植被指数 (-1 to 1)',
-            'SAVI': '土壤调节植被指数 (-1 to 1)'
-        }
+        vegetation_data['parameter_descriptions'] = _PARAMETER_DESCRIPTIONS
         
         print(f"✅ 植被参数数据获取完成 - 成功率: {vegetation_data['success_rate']}%")
         return vegetation_data
@@ -504,11 +710,71 @@ def get_vegetation_data(lat, lon, days_back=30):
             'success': False
         }
 
+def quantize_vegetation_data(vegetation_data):
+    """
+    将植被参数编码为定点整数（如NDVI×10000），并附带 scale_factors 供客户端还原
+    
+    返回新字典，不修改（可能来自缓存的）原始数据；未列出缩放因子的参数原样返回
+    """
+    if 'error' in vegetation_data:
+        return vegetation_data
+    
+    quantized = dict(vegetation_data)
+    scale_factors = {}
+    for section in ('sentinel2_data', 'modis_data', 'estimated_values'):
+        values = {}
+        for name, value in vegetation_data.get(section, {}).items():
+            scale = _QUANTIZE_SCALES.get(name)
+            if scale is not None and isinstance(value, float):
+                values[name] = int(round(value * scale))
+                scale_factors[name] = scale
+            else:
+                values[name] = value
+        quantized[section] = values
+    
+    quantized['scale_factors'] = scale_factors
+    return quantized
+
+def _query_timestamp():
+    """当前本地时间字符串，每个请求只生成一次"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+
+# 端点内并发调用天气/植被查询、以及批量查询各点的共享线程池（均以网络等待为主）；
+# 提交的任务不能再向该线程池提交并等待，否则线程池占满时会互相等待
+_ENDPOINT_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='endpoint')
+
+# 批量查询单次最多坐标点数，保护GEE配额
+MAX_BATCH_SIZE = 50
+
+# 植被数据回溯天数上限，与命令行客户端的校验一致
+MAX_DAYS_BACK = 365
+
+def _query_point(point, days_back):
+    """批量查询中的单点处理：校验坐标并获取天气+植被数据，错误只影响该点"""
+    try:
+        lat = float(point.get('latitude'))
+        lon = float(point.get('longitude'))
+        
+        if not (-90 <= lat <= 90):
+            return {'error': '纬度必须在-90到90之间'}
+        if not (-180 <= lon <= 180):
+            return {'error': '经度必须在-180到180之间'}
+        
+        return {
+            'location': {'latitude': lat, 'longitude': lon},
+            'weather': get_weather_data(lat, lon),
+            'vegetation': get_vegetation_data(lat, lon, days_back)
+        }
+    
+    except Exception as e:
+        return {'error': f'数据获取失败: {str(e)}'}
+
 # ========== API 端点 ==========
 
 @app.route('/api/all', methods=['POST'])
 def get_all_data():
     """获取综合环境数据（天气+植被）"""
+    query_time = _query_timestamp()
     try:
         data = request.json
         lat = float(data.get('latitude'))
@@ -520,25 +786,69 @@ def get_all_data():
             return jsonify({'error': '纬度必须在-90到90之间'}), 400
         if not (-180 <= lon <= 180):
             return jsonify({'error': '经度必须在-180到180之间'}), 400
+        if not (1 <= days_back <= MAX_DAYS_BACK):
+            return jsonify({'error': f'回溯天数必须在1到{MAX_DAYS_BACK}之间'}), 400
         
-        # 并行获取天气和植被数据
-        weather_data = get_weather_data(lat, lon)
-        vegetation_data = get_vegetation_data(lat, lon, days_back)
+        # 并行获取天气和植被数据，总耗时约为两者中较慢的一个
+        weather_future = _ENDPOINT_EXECUTOR.submit(get_weather_data, lat, lon)
+        vegetation_future = _ENDPOINT_EXECUTOR.submit(get_vegetation_data, lat, lon, days_back)
+        weather_data = weather_future.result()
+        vegetation_data = vegetation_future.result()
+        if data.get('quantize'):
+            vegetation_data = quantize_vegetation_data(vegetation_data)
         
         return jsonify({
             'status': 'success',
             'location': {'latitude': lat, 'longitude': lon},
             'weather': weather_data,
             'vegetation': vegetation_data,
-            'query_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'query_time': query_time
         })
         
     except Exception as e:
         return jsonify({'error': f'数据获取失败: {str(e)}'}), 500
 
+@app.route('/api/batch', methods=['POST'])
+def get_batch_data():
+    """批量获取多个坐标点的综合环境数据（天气+植被），结果顺序与输入一致"""
+    query_time = _query_timestamp()
+    try:
+        data = request.get_json(silent=True)
+        # 支持直接传坐标列表，或 {"points": [...], "days_back": 30}
+        if isinstance(data, list):
+            points, days_back = data, 30
+        elif isinstance(data, dict):
+            points = data.get('points')
+            days_back = int(data.get('days_back', 30))
+        else:
+            return jsonify({'error': '请求体应为坐标点列表或 {"points": [...]} 对象'}), 400
+        
+        if not (1 <= days_back <= MAX_DAYS_BACK):
+            return jsonify({'error': f'回溯天数必须在1到{MAX_DAYS_BACK}之间'}), 400
+        if not isinstance(points, list) or not points:
+            return jsonify({'error': '请提供非空的坐标点列表'}), 400
+        if len(points) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'单次最多查询{MAX_BATCH_SIZE}个坐标点'}), 400
+        if not all(isinstance(point, dict) for point in points):
+            return jsonify({'error': '坐标点格式应为 {"latitude": ..., "longitude": ...}'}), 400
+        
+        # 各点相互独立，在共享线程池中并发查询
+        results = list(_ENDPOINT_EXECUTOR.map(lambda point: _query_point(point, days_back), points))
+        
+        return jsonify({
+            'status': 'success',
+            'count': len(results),
+            'results': results,
+            'query_time': query_time
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'批量数据获取失败: {str(e)}'}), 500
+
 @app.route('/api/environmental_parameters', methods=['POST'])
 def get_environmental_parameters():
     """获取全部14个环境参数的专用端点"""
+    query_time = _query_timestamp()
     try:
         data = request.json
         lat = float(data.get('latitude'))
@@ -550,6 +860,8 @@ def get_environmental_parameters():
             return jsonify({'error': '纬度必须在-90到90之间'}), 400
         if not (-180 <= lon <= 180):
             return jsonify({'error': '经度必须在-180到180之间'}), 400
+        if not (1 <= days_back <= MAX_DAYS_BACK):
+            return jsonify({'error': f'回溯天数必须在1到{MAX_DAYS_BACK}之间'}), 400
         
         # 获取全部环境参数
         vegetation_data = get_vegetation_data(lat, lon, days_back)
@@ -609,7 +921,7 @@ def get_environmental_parameters():
                 'estimated': '基于算法估算'
             },
             'raw_data': vegetation_data,
-            'query_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'query_time': query_time
         })
         
     except Exception as e:
@@ -618,6 +930,7 @@ def get_environmental_parameters():
 @app.route('/api/weather', methods=['POST'])
 def get_weather_only():
     """仅获取天气数据"""
+    query_time = _query_timestamp()
     try:
         data = request.json
         lat = float(data.get('latitude'))
@@ -635,7 +948,7 @@ def get_weather_only():
             'status': 'success',
             'location': {'latitude': lat, 'longitude': lon},
             'weather': weather_data,
-            'query_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'query_time': query_time
         })
         
     except Exception as e:
@@ -644,6 +957,7 @@ def get_weather_only():
 @app.route('/api/vegetation', methods=['POST'])
 def get_vegetation_only():
     """仅获取植被参数"""
+    query_time = _query_timestamp()
     try:
         data = request.json
         lat = float(data.get('latitude'))
@@ -655,14 +969,18 @@ def get_vegetation_only():
             return jsonify({'error': '纬度必须在-90到90之间'}), 400
         if not (-180 <= lon <= 180):
             return jsonify({'error': '经度必须在-180到180之间'}), 400
+        if not (1 <= days_back <= MAX_DAYS_BACK):
+            return jsonify({'error': f'回溯天数必须在1到{MAX_DAYS_BACK}之间'}), 400
         
         vegetation_data = get_vegetation_data(lat, lon, days_back)
+        if data.get('quantize'):
+            vegetation_data = quantize_vegetation_data(vegetation_data)
         
         return jsonify({
             'status': 'success',
             'location': {'latitude': lat, 'longitude': lon},
             'vegetation': vegetation_data,
-            'query_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'query_time': query_time
         })
         
     except Exception as e:
@@ -690,8 +1008,10 @@ def get_simple_data():
 @app.route('/api/status', methods=['GET'])
 def get_api_status():
     """API状态检查"""
+    query_time = _query_timestamp()
     try:
         # 测试GEE连接
+        init_earth_engine()
         test_point = ee.Geometry.Point([116.4074, 39.9042])
         test_collection = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED').limit(1)
         test_size = test_collection.size().getInfo()
@@ -705,20 +1025,21 @@ def get_api_status():
             },
             'available_endpoints': [
                 '/api/all - 获取所有数据',
+                f'/api/batch - 批量获取多点数据（最多{MAX_BATCH_SIZE}个）',
                 '/api/environmental_parameters - 获取14个环境参数',
                 '/api/weather - 仅天气数据',
                 '/api/vegetation - 仅植被数据',
                 '/api/simple - 简单测试接口',
                 '/api/status - 服务状态'
             ],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': query_time
         })
         
     except Exception as e:
         return jsonify({
             'status': 'error',
             'error': str(e),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': query_time
         })
 
 # ========== 健康检查 ==========
@@ -738,9 +1059,12 @@ if __name__ == '__main__':
     print("🔍 API端点:")
     print("   POST /api/environmental_parameters - 获取全部14个环境参数")
     print("   POST /api/all - 获取天气+植被综合数据")
+    print(f"   POST /api/batch - 批量获取多点综合数据 (最多{MAX_BATCH_SIZE}个)")
     print("   POST /api/weather - 仅天气数据")
     print("   POST /api/vegetation - 仅植被数据")
     print("   GET  /api/simple - 简单测试接口")
     print("   GET  /api/status - 服务状态检查")
+    print("💡 生产环境请使用: gunicorn -c gunicorn.conf.py weather_vegetation_service:app")
     
-    app.run(host='0.0.0.0', port=8081, debug=True) 
\ No newline at end of file
+    # 开发服务器仅用于本地调试；多线程处理请求，避免慢请求阻塞其他请求
+    app.run(host='0.0.0.0', port=8081, threaded=True)
@@ -5,25 +5,117 @@
 坐标 -> 建筑名称、片区名称、城市名称
 """
 
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 import json
+import os
 import sys
-from typing import Dict, Optional
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+# orjson为可选依赖：未安装时使用标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """序列化为UTF-8编码的JSON字节（优先使用orjson），所有JSON输出统一经过此函数"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+# 逆编码结果缓存：地址信息变化很慢，24小时内重复坐标直接复用
+CACHE_TTL_SECONDS = 24 * 3600
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'weatherg', 'tencent_reverse')
+MEMORY_CACHE_SIZE = 4096
+
+# 默认返回的周边POI数量和搜索半径（米）：POI数量直接决定响应体大小
+DEFAULT_POI_PAGE_SIZE = 5
+DEFAULT_POI_RADIUS = 1000
+
+# 地址参考信息中提取的字段
+REFERENCE_KEYS = ('famous_area', 'landmark_l1', 'landmark_l2', 'town')
+
+@dataclass(slots=True)
+class LocationInfo:
+    """逆编码解析后的位置信息"""
+    # 基础地址信息
+    address: str = ''
+    province: str = ''
+    city: str = ''
+    district: str = ''
+    street: str = ''
+    street_number: str = ''
+    # 格式化地址
+    recommend_address: str = ''
+    rough_address: str = ''
+    # 行政区划
+    adcode: str = ''
+    nation: str = ''
+    # 地址参考：{'title', 'distance', 'direction'}，无数据时为空字典
+    famous_area: Dict = field(default_factory=dict)
+    landmark_l1: Dict = field(default_factory=dict)
+    landmark_l2: Dict = field(default_factory=dict)
+    town: Dict = field(default_factory=dict)
+    # 周边POI：{'title', 'address', 'category', 'distance'}
+    nearby_pois: List[Dict] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        return asdict(self)
 
 class TencentMapReverseGeocoder:
     """腾讯地图逆地址编码工具类"""
     
-    def __init__(self, api_key: str):
+    __slots__ = ('api_key', 'base_url', 'cache_dir', 'cache_ttl', '_memory_cache', 'session')
+    
+    def __init__(self, api_key: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, cache_ttl: int = CACHE_TTL_SECONDS):
         """
         初始化腾讯地图逆编码器
         
         Args:
             api_key: 腾讯地图API密钥
+            cache_dir: 逆编码结果磁盘缓存目录，为None时只使用内存缓存
+            cache_ttl: 磁盘缓存有效期（秒）
         """
         self.api_key = api_key
         self.base_url = "https://apis.map.qq.com/ws/geocoder/v1/"
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        # 内存缓存：坐标保留5位小数（约1米）作为键
+        self._memory_cache: Dict = {}
+        
+        # 复用连接的HTTP会话：批量查询时避免每次重新进行TCP/TLS握手
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        ))
+        # 请求压缩响应；ACCEPT_ENCODING 仅包含urllib3能解码的编码（安装brotli后自动包含br）
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    
+    def close(self):
+        """关闭HTTP会话"""
+        self.session.close()
     
-    def reverse_geocode(self, lat: float, lng: float, get_poi: bool = True) -> Optional[Dict]:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def reverse_geocode(self, lat: float, lng: float, get_poi: bool = True,
+                        page_size: int = DEFAULT_POI_PAGE_SIZE, radius: int = DEFAULT_POI_RADIUS) -> Optional[Dict]:
         """
         坐标逆编码获取地址信息
         
@@ -31,26 +123,39 @@ class TencentMapReverseGeocoder:
             lat: 纬度
             lng: 经度
             get_poi: 是否获取周边POI信息
+            page_size: 返回的周边POI数量
+            radius: 周边POI搜索半径（米）
         
         Returns:
             解析后的地址信息字典，失败返回None
         """
+        cache_key = (round(lat, 5), round(lng, 5), bool(get_poi), page_size, radius)
+        cached = self._memory_cache.get(cache_key)
+        if cached is None:
+            cached = self._load_cached_result(cache_key)
+            if cached is not None:
+                self._remember(cache_key, cached)
+        if cached is not None:
+            return cached
+        
         try:
             # 构建请求参数
             params = {
                 'location': f"{lat},{lng}",
                 'key': self.api_key,
                 'get_poi': 1 if get_poi else 0,
-                'poi_options': 'address_format=short;radius=1000;page_size=10;policy=1'
+                'poi_options': f'address_format=short;radius={radius};page_size={page_size};policy=1'
             }
             
             # 发送请求
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else json.loads(response.content)
                 
                 if data.get('status') == 0:
+                    self._remember(cache_key, data)
+                    self._save_cached_result(cache_key, data)
                     return data
                 else:
                     print(f"腾讯地图API错误: {data.get('message', '未知错误')}")
@@ -66,20 +171,65 @@ class TencentMapReverseGeocoder:
             print(f"逆编码失败: {e}")
             return None
     
-    def parse_location_info(self, geocode_result: Dict) -> Dict:
+    def _remember(self, cache_key: tuple, data: Dict):
+        """写入内存缓存，超出容量时淘汰最早写入的条目"""
+        if len(self._memory_cache) >= MEMORY_CACHE_SIZE:
+            self._memory_cache.pop(next(iter(self._memory_cache)), None)
+        self._memory_cache[cache_key] = data
+    
+    def _cache_path(self, cache_key: tuple) -> Optional[str]:
+        """坐标对应的缓存文件路径（按坐标键的SHA1命名）"""
+        if not self.cache_dir:
+            return None
+        lat, lng, get_poi, page_size, radius = cache_key
+        key = hashlib.sha1(f"{lat:.5f},{lng:.5f},{int(get_poi)},{page_size},{radius}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _load_cached_result(self, cache_key: tuple) -> Optional[Dict]:
+        """读取未过期的磁盘缓存，不存在或已过期时返回None"""
+        cache_path = self._cache_path(cache_key)
+        if not cache_path:
+            return None
+        try:
+            if time.time() - os.path.getmtime(cache_path) > self.cache_ttl:
+                return None
+            with open(cache_path, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached_result(self, cache_key: tuple, data: Dict):
+        """写入磁盘缓存，失败时忽略（缓存仅用于加速）"""
+        cache_path = self._cache_path(cache_key)
+        if not cache_path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(data))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"写入缓存失败: {e}")
+    
+    def parse_location_info(self, geocode_result: Dict, *, want_pois: Optional[int] = None) -> LocationInfo:
         """
         解析地址信息，提取关键信息
         
         Args:
             geocode_result: 腾讯地图API返回的结果
+            want_pois: 只提取最近的前N个POI，为None时提取全部
         
         Returns:
-            解析后的位置信息
+            解析后的位置信息，结果无效时各字段为空
         """
         if not geocode_result or geocode_result.get('status') != 0:
-            return {}
+            return LocationInfo()
         
         result = geocode_result.get('result', {})
+        if not result:
+            return LocationInfo()
         
         # 基本地址信息
         address = result.get('address', '')
@@ -96,35 +246,42 @@ class TencentMapReverseGeocoder:
         
         # POI信息
         pois = result.get('pois', [])
+        if want_pois is not None and want_pois < len(pois):
+            pois = pois[:want_pois]
         
-        location_info = {
+        # 地址参考（海外或偏远坐标常为空，此时跳过逐项提取）
+        if address_reference:
+            reference_get = address_reference.get
+            extract_reference = self._extract_reference_info
+            references = {key: extract_reference(reference_get(key)) for key in REFERENCE_KEYS}
+        else:
+            references = {key: {} for key in REFERENCE_KEYS}
+        
+        component_get = address_component.get
+        
+        return LocationInfo(
             # 基础地址信息
-            'address': address,
-            'province': address_component.get('province', ''),
-            'city': address_component.get('city', ''),
-            'district': address_component.get('district', ''),
-            'street': address_component.get('street', ''),
-            'street_number': address_component.get('street_number', ''),
+            address=address,
+            province=component_get('province', ''),
+            city=component_get('city', ''),
+            district=component_get('district', ''),
+            street=component_get('street', ''),
+            street_number=component_get('street_number', ''),
             
             # 格式化地址
-            'recommend_address': formatted_addresses.get('recommend', ''),
-            'rough_address': formatted_addresses.get('rough', ''),
+            recommend_address=formatted_addresses.get('recommend', ''),
+            rough_address=formatted_addresses.get('rough', ''),
             
             # 行政区划
-            'adcode': ad_info.get('adcode', ''),
-            'nation': ad_info.get('nation', ''),
+            adcode=ad_info.get('adcode', ''),
+            nation=ad_info.get('nation', ''),
             
             # 地址参考
-            'famous_area': self._extract_reference_info(address_reference.get('famous_area')),
-            'landmark_l1': self._extract_reference_info(address_reference.get('landmark_l1')),
-            'landmark_l2': self._extract_reference_info(address_reference.get('landmark_l2')),
-            'town': self._extract_reference_info(address_reference.get('town')),
+            **references,
             
-            # POI信息（最近的几个）
-            'nearby_pois': self._extract_poi_info(pois[:20])
-        }
-        
-        return location_info
+            # POI信息（数量由请求的page_size和want_pois决定）
+            nearby_pois=self._extract_poi_info(pois)
+        )
     
     def _extract_reference_info(self, reference_obj) -> Dict:
         """提取参考位置信息"""
@@ -139,67 +296,69 @@ class TencentMapReverseGeocoder:
     
     def _extract_poi_info(self, pois) -> list:
         """提取POI信息"""
-        poi_list = []
-        for poi in pois:
-            poi_info = {
+        return [
+            {
                 'title': poi.get('title', ''),
                 'address': poi.get('address', ''),
                 'category': poi.get('category', ''),
                 'distance': poi.get('_distance', 0)
             }
-            poi_list.append(poi_info)
-        return poi_list
+            for poi in pois
+        ]
 
-def print_location_details(location_info: Dict):
+def print_location_details(location_info: LocationInfo):
     """
-    打印位置详细信息
+    打印位置详细信息（整体缓冲后一次写出）
     """
-    print("地址逆编码结果:")
-    print("=" * 60)
+    lines = []
+    lines.append("地址逆编码结果:")
+    lines.append("=" * 60)
     
     # 基础信息
-    print(f"完整地址: {location_info.get('address', '未知')}")
-    print(f"推荐地址: {location_info.get('recommend_address', '未知')}")
-    print(f"粗略地址: {location_info.get('rough_address', '未知')}")
+    lines.append(f"完整地址: {location_info.address or '未知'}")
+    lines.append(f"推荐地址: {location_info.recommend_address or '未知'}")
+    lines.append(f"粗略地址: {location_info.rough_address or '未知'}")
     
     # 行政区划
-    print(f"\n行政区划:")
-    print(f"  国家: {location_info.get('nation', '未知')}")
-    print(f"  省份: {location_info.get('province', '未知')}")
-    print(f"  城市: {location_info.get('city', '未知')}")
-    print(f"  区县: {location_info.get('district', '未知')}")
-    print(f"  街道: {location_info.get('street', '未知')}")
-    print(f"  门牌号: {location_info.get('street_number', '未知')}")
-    print(f"  行政代码: {location_info.get('adcode', '未知')}")
+    lines.append(f"\n行政区划:")
+    lines.append(f"  国家: {location_info.nation or '未知'}")
+    lines.append(f"  省份: {location_info.province or '未知'}")
+    lines.append(f"  城市: {location_info.city or '未知'}")
+    lines.append(f"  区县: {location_info.district or '未知'}")
+    lines.append(f"  街道: {location_info.street or '未知'}")
+    lines.append(f"  门牌号: {location_info.street_number or '未知'}")
+    lines.append(f"  行政代码: {location_info.adcode or '未知'}")
     
     # 地标信息
-    print(f"\n地标参考:")
-    famous_area = location_info.get('famous_area', {})
+    lines.append(f"\n地标参考:")
+    famous_area = location_info.famous_area
     if famous_area.get('title'):
-        print(f"  知名区域: {famous_area['title']} (距离: {famous_area.get('distance', 0)}米, 方位: {famous_area.get('direction', '')})")
+        lines.append(f"  知名区域: {famous_area['title']} (距离: {famous_area.get('distance', 0)}米, 方位: {famous_area.get('direction', '')})")
     
-    landmark_l1 = location_info.get('landmark_l1', {})
+    landmark_l1 = location_info.landmark_l1
     if landmark_l1.get('title'):
-        print(f"  一级地标: {landmark_l1['title']} (距离: {landmark_l1.get('distance', 0)}米, 方位: {landmark_l1.get('direction', '')})")
+        lines.append(f"  一级地标: {landmark_l1['title']} (距离: {landmark_l1.get('distance', 0)}米, 方位: {landmark_l1.get('direction', '')})")
     
-    landmark_l2 = location_info.get('landmark_l2', {})
+    landmark_l2 = location_info.landmark_l2
     if landmark_l2.get('title'):
-        print(f"  二级地标: {landmark_l2['title']} (距离: {landmark_l2.get('distance', 0)}米, 方位: {landmark_l2.get('direction', '')})")
+        lines.append(f"  二级地标: {landmark_l2['title']} (距离: {landmark_l2.get('distance', 0)}米, 方位: {landmark_l2.get('direction', '')})")
     
-    town = location_info.get('town', {})
+    town = location_info.town
     if town.get('title'):
-        print(f"  乡镇街道: {town['title']} (距离: {town.get('distance', 0)}米, 方位: {town.get('direction', '')})")
+        lines.append(f"  乡镇街道: {town['title']} (距离: {town.get('distance', 0)}米, 方位: {town.get('direction', '')})")
     
     # 附近POI
-    nearby_pois = location_info.get('nearby_pois', [])
+    nearby_pois = location_info.nearby_pois
     if nearby_pois:
-        print(f"\n附近建筑/POI (前20个):")
+        lines.append(f"\n附近建筑/POI (前{len(nearby_pois)}个):")
         for i, poi in enumerate(nearby_pois, 1):
-            print(f"  {i}. {poi['title']}")
-            print(f"     类别: {poi['category']}")
-            print(f"     地址: {poi['address']}")
-            print(f"     距离: {poi['distance']}米")
-            print()
+            lines.append(f"  {i}. {poi['title']}")
+            lines.append(f"     类别: {poi['category']}")
+            lines.append(f"     地址: {poi['address']}")
+            lines.append(f"     距离: {poi['distance']}米")
+            lines.append('')
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 def test_coordinates():
     """测试几个坐标点"""
@@ -213,104 +372,132 @@ def test_coordinates():
     
     return test_locations
 
+def _latitude(value):
+    """argparse参数类型：纬度"""
+    try:
+        lat = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"坐标格式不正确，请输入有效的数字: {value}")
+    if not (-90 <= lat <= 90):
+        raise argparse.ArgumentTypeError("纬度必须在-90到90之间")
+    return lat
+
+def _longitude(value):
+    """argparse参数类型：经度"""
+    try:
+        lng = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"坐标格式不正确，请输入有效的数字: {value}")
+    if not (-180 <= lng <= 180):
+        raise argparse.ArgumentTypeError("经度必须在-180到180之间")
+    return lng
+
+def build_arg_parser():
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='tencent_location_reverse.py',
+        usage='%(prog)s [-h] API_KEY (纬度 经度 | test)',
+        description='腾讯地图坐标逆编码：坐标 -> 建筑名称、片区名称、城市名称',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""获取API密钥:
+  1. 访问 https://lbs.qq.com/
+  2. 注册并登录腾讯位置服务
+  3. 创建应用并获取Key
+
+示例:
+  python tencent_location_reverse.py YOUR_API_KEY 39.9042 116.4074
+  python tencent_location_reverse.py YOUR_API_KEY test"""
+    )
+    parser.add_argument('api_key', metavar='API_KEY', help='腾讯地图API密钥')
+    parser.add_argument('target', metavar='纬度|test', nargs='?',
+                        help='纬度 (-90 到 90 之间的数值)，或 test 运行预设测试点')
+    parser.add_argument('longitude', metavar='经度', nargs='?', type=_longitude,
+                        help='经度 (-180 到 180 之间的数值)')
+    return parser
+
 def main():
     """主函数"""
+    parser = build_arg_parser()
     if len(sys.argv) < 2:
-        print("用法:")
-        print("  python tencent_location_reverse.py <API_KEY> [纬度] [经度]")
-        print("  python tencent_location_reverse.py <API_KEY> test")
-        print()
-        print("参数说明:")
-        print("  API_KEY: 腾讯地图API密钥")
-        print("  纬度: -90 到 90 之间的数值")
-        print("  经度: -180 到 180 之间的数值")
-        print("  test: 运行预设测试点")
-        print()
-        print("获取API密钥:")
-        print("  1. 访问 https://lbs.qq.com/")
-        print("  2. 注册并登录腾讯位置服务")
-        print("  3. 创建应用并获取Key")
-        print()
-        print("示例:")
-        print("  python tencent_location_reverse.py YOUR_API_KEY 39.9042 116.4074")
-        print("  python tencent_location_reverse.py YOUR_API_KEY test")
+        parser.print_help()
         return
     
-    api_key = sys.argv[1]
-    
-    if not api_key:
-        print("错误: 请提供有效的API密钥")
-        return
+    # 参数类型转换和范围校验由argparse一次完成
+    args = parser.parse_args()
     
-    # 创建逆编码器
-    geocoder = TencentMapReverseGeocoder(api_key)
+    if not args.api_key:
+        parser.error("请提供有效的API密钥")
+    if args.target is None:
+        parser.error("参数不足，请指定坐标或使用 'test' 参数进行批量测试")
     
-    if len(sys.argv) >= 4:
-        # 单个坐标测试
+    test_mode = args.target.lower() == 'test' and args.longitude is None
+    if not test_mode:
         try:
-            lat = float(sys.argv[2])
-            lng = float(sys.argv[3])
-            
-            if not (-90 <= lat <= 90):
-                print("错误: 纬度必须在-90到90之间")
-                return
-            if not (-180 <= lng <= 180):
-                print("错误: 经度必须在-180到180之间")
-                return
-            
-            print(f"查询坐标: ({lat}, {lng})")
-            print("=" * 60)
-            
-            # 执行逆编码
-            result = geocoder.reverse_geocode(lat, lng)
-            
-            if result:
-                location_info = geocoder.parse_location_info(result)
-                print_location_details(location_info)
-            else:
-                print("逆编码失败!")
-                
-        except ValueError:
-            print("错误: 坐标格式不正确，请输入有效的数字")
-        except Exception as e:
-            print(f"发生错误: {e}")
+            lat = _latitude(args.target)
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        if args.longitude is None:
+            parser.error("参数不足，请同时指定纬度和经度")
+        lng = args.longitude
     
-    elif len(sys.argv) == 3 and sys.argv[2].lower() == 'test':
-        # 批量测试模式
-        test_locations = test_coordinates()
-        
-        print("批量测试模式")
-        print("=" * 60)
+    # 创建逆编码器，结束时关闭HTTP会话
+    with TencentMapReverseGeocoder(args.api_key) as geocoder:
+        if not test_mode:
+            # 单个坐标测试
+            try:
+                print(f"查询坐标: ({lat}, {lng})")
+                print("=" * 60)
+                
+                # 执行逆编码
+                result = geocoder.reverse_geocode(lat, lng)
+                
+                if result:
+                    location_info = geocoder.parse_location_info(result)
+                    print_location_details(location_info)
+                else:
+                    print("逆编码失败!")
+                
+            except Exception as e:
+                print(f"发生错误: {e}")
         
-        for lat, lng, name in test_locations:
-            print(f"\n🔍 测试点: {name} ({lat}, {lng})")
-            print("-" * 40)
+        else:
+            # 批量测试模式
+            test_locations = test_coordinates()
             
-            result = geocoder.reverse_geocode(lat, lng)
+            print("批量测试模式")
+            print("=" * 60)
             
-            if result:
-                location_info = geocoder.parse_location_info(result)
-                
-                # 简化输出，只显示关键信息
-                print(f"完整地址: {location_info.get('address', '未知')}")
-                print(f"行政区划: {location_info.get('province', '')} > {location_info.get('city', '')} > {location_info.get('district', '')}")
+            # 各测试点并发查询（只显示最近的一个建筑，只请求1个POI），按原顺序输出
+            with ThreadPoolExecutor(max_workers=len(test_locations)) as executor:
+                results = list(executor.map(
+                    lambda location: geocoder.reverse_geocode(location[0], location[1], page_size=1),
+                    test_locations
+                ))
+            
+            for (lat, lng, name), result in zip(test_locations, results):
+                print(f"\n🔍 测试点: {name} ({lat}, {lng})")
+                print("-" * 40)
                 
-                # 显示最近的建筑
-                pois = location_info.get('nearby_pois', [])
-                if pois:
-                    print(f"最近建筑: {pois[0]['title']} ({pois[0]['distance']}米)")
+                if result:
+                    location_info = geocoder.parse_location_info(result, want_pois=1)
+                    
+                    # 简化输出，只显示关键信息
+                    print(f"完整地址: {location_info.address or '未知'}")
+                    print(f"行政区划: {location_info.province} > {location_info.city} > {location_info.district}")
+                    
+                    # 显示最近的建筑
+                    pois = location_info.nearby_pois
+                    if pois:
+                        print(f"最近建筑: {pois[0]['title']} ({pois[0]['distance']}米)")
+                    
+                    # 显示地标
+                    landmark = location_info.landmark_l1 or location_info.famous_area
+                    if landmark.get('title'):
+                        print(f"地标参考: {landmark['title']}")
+                else:
+                    print("❌ 逆编码失败")
                 
-                # 显示地标
-                landmark = location_info.get('landmark_l1', {}) or location_info.get('famous_area', {})
-                if landmark.get('title'):
-                    print(f"地标参考: {landmark['title']}")
-            else:
-                print("❌ 逆编码失败")
-            
-            print()
-    
-    else:
-        print("参数不足，请指定坐标或使用 'test' 参数进行批量测试")
+                print()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
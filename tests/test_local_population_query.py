@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""local_population_query 像素定位测试：与rasterio的src.index逐位一致"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+from rasterio.transform import from_origin
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from local_population_query import LocalPopulationQuery
+
+# 0.01°网格，原点 (100, 40)，20×20像素
+ORIGIN_LON, ORIGIN_LAT, RES, SIZE = 100.0, 40.0, 0.01, 20
+
+# 恰好落在像素边界上的坐标（十进制字面量，如 39.99、100.07）
+EDGE_POINTS = [
+    (round(ORIGIN_LAT - k * RES, 2), round(ORIGIN_LON + k * RES, 2))
+    for k in range(1, SIZE - 1)
+]
+
+
+@pytest.fixture
+def raster_dir(tmp_path):
+    data = (np.arange(SIZE)[:, None] * 100 + np.arange(SIZE)[None, :]).astype(np.float32)
+    with rasterio.open(
+        tmp_path / 'chn_ppp_2020.tif', 'w', driver='GTiff',
+        width=SIZE, height=SIZE, count=1, dtype='float32', crs='EPSG:4326',
+        transform=from_origin(ORIGIN_LON, ORIGIN_LAT, RES, RES), nodata=-99999.0
+    ) as dst:
+        dst.write(data, 1)
+    return tmp_path
+
+
+def test_single_coordinate_matches_src_index_on_pixel_edges(raster_dir):
+    query = LocalPopulationQuery(str(raster_dir))
+    filepath = query.available_files[2020]
+    with rasterio.open(filepath) as src:
+        for lat, lon in EDGE_POINTS:
+            result = query.query_single_coordinate(filepath, lat, lon)
+            row, col = src.index(lon, lat)
+            assert (result['coordinate']['pixel_row'], result['coordinate']['pixel_col']) == (row, col)
+            assert result['population_data']['density_per_km2'] == row * 100 + col
+    query.close()
+
+
+def test_batch_matches_src_index_on_pixel_edges(raster_dir):
+    query = LocalPopulationQuery(str(raster_dir))
+    batch = query.query_coordinates_batch(EDGE_POINTS, 2020)
+    with rasterio.open(query.available_files[2020]) as src:
+        for (lat, lon), result in zip(EDGE_POINTS, batch['results']):
+            row, col = src.index(lon, lat)
+            assert (result['coordinate']['pixel_row'], result['coordinate']['pixel_col']) == (row, col)
+            assert result['population_data']['density_per_km2'] == row * 100 + col
+    query.close()
+
+
+def test_batch_reads_points_individually_above_window_cap(raster_dir, monkeypatch):
+    import local_population_query
+    query = LocalPopulationQuery(str(raster_dir))
+    expected = query.query_coordinates_batch(EDGE_POINTS, 2020)
+    monkeypatch.setattr(local_population_query, 'MAX_BATCH_WINDOW_PIXELS', 1)
+    assert query.query_coordinates_batch(EDGE_POINTS, 2020) == expected
+    query.close()
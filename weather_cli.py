@@ -5,18 +5,89 @@
 支持获取天气数据和14个环境参数
 """
 
+import argparse
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 import sys
 import json
 from datetime import datetime
+from types import MappingProxyType
+
+# orjson为可选依赖：未安装时使用标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 所有输出经由日志记录器：-q 时只输出警告和错误，被屏蔽的消息不做格式化
+log = logging.getLogger('weatherg')
+
+# 共享的HTTP会话：两次查询请求同一后端，复用连接
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+# 请求压缩响应；ACCEPT_ENCODING 仅包含urllib3能解码的编码（安装brotli后自动包含br）
+_SESSION.headers['Accept-Encoding'] = ACCEPT_ENCODING
+
+# 参数说明表（只读，模块内共享）
+# MODIS 数据指标解释
+_MODIS_DESC = MappingProxyType({
+    'LAI': 'LAI (叶面积指数)',
+    'FAPAR': 'FAPAR (光合有效辐射吸收率)',
+    'Albedo': 'Albedo (宽带反照率)',
+    'DSR': 'DSR (向下短波辐射)',
+    'PAR': 'PAR (光合有效辐射)',
+    'LST_Day': 'LST_Day (白天地表温度)',
+    'LST_Night': 'LST_Night (夜间地表温度)',
+    'ET': 'ET (蒸散发)',
+    'GPP': 'GPP (总初级生产力)',
+    'Snow_Cover': 'Snow_Cover (积雪覆盖)'
+})
+
+# 估算值指标解释
+_ESTIMATED_DESC = MappingProxyType({
+    'FVC': 'FVC (植被覆盖度)',
+    'BBE': 'BBE (宽带发射率)',
+    'AGB': 'AGB (地上生物量)'
+})
+
+# 14个环境参数：(中文名, 单位, 描述)
+_PARAM_DESC = MappingProxyType({
+    'LAI': ('叶面积指数', 'm²/m²', '单位地面上叶片总面积'),
+    'FAPAR': ('光合有效辐射吸收率', '无量纲', '植被吸收的光能比例'),
+    'FVC': ('植被覆盖度', '%', '地面植被覆盖百分比'),
+    'Albedo': ('宽带反照率', '无量纲', '地表反射辐射比例'),
+    'BBE': ('宽带发射率', '无量纲', '地表发射长波辐射能力'),
+    'DSR': ('向下短波辐射', 'W/m²', '太阳辐射到达地表能量'),
+    'PAR': ('光合有效辐射', 'μmol/(m²·s)', '植物光合作用可用光能'),
+    'LST': ('地表温度', '°C', '地表热红外温度'),
+    'ET': ('蒸散发', 'mm/day', '水分蒸发和植物蒸腾'),
+    'GPP': ('总初级生产力', 'g C/m²/day', '植被碳固定速率'),
+    'SCE': ('积雪覆盖范围', '%', '地表积雪覆盖比例'),
+    'AGB': ('地上生物量', 'Mg/ha', '地上部分植被重量'),
+    'LWNR': ('净长波辐射', 'W/m²', '净长波辐射通量'),
+    'NR': ('净辐射', 'W/m²', '净辐射通量')
+})
+
+# 14个环境参数的输出模板（每个参数一段，以空行分隔）
+_PARAM_TMPL = "{idx:2d}. {param} - {name}\n    描述: {desc}\n    单位: {unit}\n{detail}\n"
+_LST_TMPL = "    白天温度: {day}\n    夜间温度: {night}"
+_NO_DATA_DETAIL = "    状态: 无数据 (该区域可能无有效数据)"
 
 def get_weather_and_vegetation_data(lat, lon, days_back=30):
     """
     获取天气和植被数据
     """
     try:
-        print(f"正在查询坐标 ({lat}, {lon}) 的数据...")
-        print(f"植被数据回溯天数: {days_back}")
+        log.info("正在查询坐标 (%s, %s) 的数据...", lat, lon)
+        log.info("植被数据回溯天数: %s", days_back)
         
         # 调用综合数据API
         url = "http://localhost:8081/api/all"
@@ -26,25 +97,25 @@ def get_weather_and_vegetation_data(lat, lon, days_back=30):
             "days_back": days_back
         }
         
-        response = requests.post(url, json=payload, timeout=30)
+        response = _SESSION.post(url, json=payload, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else json.loads(response.content)
             if data['status'] == 'success':
                 return data
             else:
-                print(f"API返回错误: {data.get('error', '未知错误')}")
+                log.error("API返回错误: %s", data.get('error', '未知错误'))
                 return None
         else:
-            print(f"HTTP错误 {response.status_code}: {response.text}")
+            log.error("HTTP错误 %s: %s", response.status_code, response.content.decode('utf-8', errors='replace'))
             return None
             
     except requests.exceptions.ConnectionError:
-        print("连接失败: 请确保后端服务已启动")
-        print("启动命令: cd src && python weather_vegetation_service.py")
+        log.error("连接失败: 请确保后端服务已启动")
+        log.error("启动命令: cd src && python weather_vegetation_service.py")
         return None
     except Exception as e:
-        print(f"请求失败: {e}")
+        log.error("请求失败: %s", e)
         return None
 
 def get_14_environmental_parameters(lat, lon, days_back=30):
@@ -59,21 +130,21 @@ def get_14_environmental_parameters(lat, lon, days_back=30):
             "days_back": days_back
         }
         
-        response = requests.post(url, json=payload, timeout=30)
+        response = _SESSION.post(url, json=payload, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else json.loads(response.content)
             if data['status'] == 'success':
                 return data
             else:
-                print(f"环境参数API返回错误: {data.get('error', '未知错误')}")
+                log.error("环境参数API返回错误: %s", data.get('error', '未知错误'))
                 return None
         else:
-            print(f"环境参数HTTP错误 {response.status_code}: {response.text}")
+            log.error("环境参数HTTP错误 %s: %s", response.status_code, response.content.decode('utf-8', errors='replace'))
             return None
             
     except Exception as e:
-        print(f"环境参数请求失败: {e}")
+        log.error("环境参数请求失败: %s", e)
         return None
 
 def print_weather_info(weather_data):
@@ -81,178 +152,153 @@ def print_weather_info(weather_data):
     打印天气信息
     """
     if 'error' in weather_data:
-        print(f"天气数据错误: {weather_data['error']}")
+        log.error("天气数据错误: %s", weather_data['error'])
+        return
+    if not log.isEnabledFor(logging.INFO):
         return
     
+    # 输出整体缓冲后一次写出
+    lines = []
     current = weather_data.get('current', {})
     location = weather_data.get('location', {})
     
-    print("\n天气信息:")
-    print("----------------------------------------")
-    print(f"温度: {current.get('temperature', 'N/A')}°C")
-    print(f"湿度: {current.get('humidity', 'N/A')}%")
-    print(f"气压: {current.get('pressure', 'N/A')} hPa")
-    print(f"风速: {current.get('wind_speed', 'N/A')} m/s")
+    lines.append("\n天气信息:")
+    lines.append("----------------------------------------")
+    lines.append(f"温度: {current.get('temperature', 'N/A')}°C")
+    lines.append(f"湿度: {current.get('humidity', 'N/A')}%")
+    lines.append(f"气压: {current.get('pressure', 'N/A')} hPa")
+    lines.append(f"风速: {current.get('wind_speed', 'N/A')} m/s")
     
     if current.get('wind_direction'):
-        print(f"风向: {current.get('wind_direction', 'N/A')}°")
+        lines.append(f"风向: {current.get('wind_direction', 'N/A')}°")
     
-    print(f"天气: {current.get('description', 'N/A')}")
+    lines.append(f"天气: {current.get('description', 'N/A')}")
     
     if current.get('note'):
-        print(f"说明: {current.get('note')}")
+        lines.append(f"说明: {current.get('note')}")
     
     if location.get('name'):
-        print(f"\n位置: {location.get('name')}, {location.get('country', 'Unknown')}")
+        lines.append(f"\n位置: {location.get('name')}, {location.get('country', 'Unknown')}")
     
     if location.get('timezone'):
-        print(f"时区: {location.get('timezone')}")
+        lines.append(f"时区: {location.get('timezone')}")
+    
+    log.info('\n'.join(lines))
 
 def print_traditional_vegetation_info(vegetation_data):
     """
     打印传统植被参数信息（保留原有功能）
     """
     if 'error' in vegetation_data:
-        print(f"植被数据错误: {vegetation_data['error']}")
+        log.error("植被数据错误: %s", vegetation_data['error'])
+        return
+    if not log.isEnabledFor(logging.INFO):
         return
     
-    print("\n传统植被参数:")
-    print("----------------------------------------")
+    # 输出整体缓冲后一次写出
+    lines = []
+    lines.append("\n传统植被参数:")
+    lines.append("----------------------------------------")
     
     # Sentinel-2 数据
     sentinel2_data = vegetation_data.get('sentinel2_data', {})
     if sentinel2_data:
-        print("Sentinel-2 数据:")
+        lines.append("Sentinel-2 数据:")
         if 'NDVI' in sentinel2_data:
-            print(f"   NDVI (植被指数): {sentinel2_data['NDVI']}")
+            lines.append(f"   NDVI (植被指数): {sentinel2_data['NDVI']}")
         if 'EVI' in sentinel2_data:
-            print(f"   EVI (增强植被指数): {sentinel2_data['EVI']}")
+            lines.append(f"   EVI (增强植被指数): {sentinel2_data['EVI']}")
         if 'SAVI' in sentinel2_data:
-            print(f"   SAVI (土壤调节植被指数): {sentinel2_data['SAVI']}")
-    
-    # MODIS 数据指标解释
-    modis_descriptions = {
-        'LAI': 'LAI (叶面积指数)',
-        'FAPAR': 'FAPAR (光合有效辐射吸收率)',
-        'Albedo': 'Albedo (宽带反照率)',
-        'DSR': 'DSR (向下短波辐射)',
-        'PAR': 'PAR (光合有效辐射)',
-        'LST_Day': 'LST_Day (白天地表温度)',
-        'LST_Night': 'LST_Night (夜间地表温度)',
-        'ET': 'ET (蒸散发)',
-        'GPP': 'GPP (总初级生产力)',
-        'Snow_Cover': 'Snow_Cover (积雪覆盖)'
-    }
+            lines.append(f"   SAVI (土壤调节植被指数): {sentinel2_data['SAVI']}")
     
     # MODIS 数据
     modis_data = vegetation_data.get('modis_data', {})
     if modis_data:
-        print("MODIS 数据:")
+        lines.append("MODIS 数据:")
         for key, value in modis_data.items():
-            description = modis_descriptions.get(key, key)
-            print(f"   {description}: {value}")
-    
-    # 估算值指标解释
-    estimated_descriptions = {
-        'FVC': 'FVC (植被覆盖度)',
-        'BBE': 'BBE (宽带发射率)',
-        'AGB': 'AGB (地上生物量)'
-    }
+            description = _MODIS_DESC.get(key, key)
+            lines.append(f"   {description}: {value}")
     
     # 估算值
     estimated_values = vegetation_data.get('estimated_values', {})
     if estimated_values:
-        print("估算参数:")
+        lines.append("估算参数:")
         for key, value in estimated_values.items():
-            description = estimated_descriptions.get(key, key)
-            print(f"   {description}: {value}")
+            description = _ESTIMATED_DESC.get(key, key)
+            lines.append(f"   {description}: {value}")
     
     # 数据完整性
     success_rate = vegetation_data.get('success_rate', 0)
-    print(f"\n数据获取成功率: {success_rate}%")
+    lines.append(f"\n数据获取成功率: {success_rate}%")
+    
+    log.info('\n'.join(lines))
 
 def print_14_environmental_parameters(env_data):
     """
     打印14个环境参数
     """
     if not env_data:
-        print("无法获取14个环境参数数据")
+        log.warning("无法获取14个环境参数数据")
+        return
+    if not log.isEnabledFor(logging.INFO):
         return
     
-    print("\n14个环境参数详情:")
-    print("=" * 80)
+    # 输出整体缓冲后一次写出
+    lines = []
+    lines.append("\n14个环境参数详情:")
+    lines.append("=" * 80)
     
     # 参数概要
     summary = env_data.get('summary', {})
-    print(f"获取概要: {summary.get('available_parameters', 0)}/{summary.get('total_parameters', 14)} 参数")
-    print(f"成功率: {summary.get('success_rate', '0%')}")
+    lines.append(f"获取概要: {summary.get('available_parameters', 0)}/{summary.get('total_parameters', 14)} 参数")
+    lines.append(f"成功率: {summary.get('success_rate', '0%')}")
     
-    print("\n" + "-" * 80)
+    lines.append("\n" + "-" * 80)
     
     # 详细参数
     parameters = env_data.get('target_parameters', {})
-    param_descriptions = {
-        'LAI': ('叶面积指数', 'm²/m²', '单位地面上叶片总面积'),
-        'FAPAR': ('光合有效辐射吸收率', '无量纲', '植被吸收的光能比例'),
-        'FVC': ('植被覆盖度', '%', '地面植被覆盖百分比'),
-        'Albedo': ('宽带反照率', '无量纲', '地表反射辐射比例'),
-        'BBE': ('宽带发射率', '无量纲', '地表发射长波辐射能力'),
-        'DSR': ('向下短波辐射', 'W/m²', '太阳辐射到达地表能量'),
-        'PAR': ('光合有效辐射', 'μmol/(m²·s)', '植物光合作用可用光能'),
-        'LST': ('地表温度', '°C', '地表热红外温度'),
-        'ET': ('蒸散发', 'mm/day', '水分蒸发和植物蒸腾'),
-        'GPP': ('总初级生产力', 'g C/m²/day', '植被碳固定速率'),
-        'SCE': ('积雪覆盖范围', '%', '地表积雪覆盖比例'),
-        'AGB': ('地上生物量', 'Mg/ha', '地上部分植被重量'),
-        'LWNR': ('净长波辐射', 'W/m²', '净长波辐射通量'),
-        'NR': ('净辐射', 'W/m²', '净辐射通量')
-    }
     
     for i, (param, value) in enumerate(parameters.items(), 1):
-        chinese_name, unit, description = param_descriptions.get(param, (param, '未知', '无描述'))
-        
-        print(f"{i:2d}. {param} - {chinese_name}")
-        print(f"    描述: {description}")
-        print(f"    单位: {unit}")
+        chinese_name, unit, description = _PARAM_DESC.get(param, (param, '未知', '无描述'))
         
         if param == 'LST' and isinstance(value, dict):
             # 地表温度特殊处理
             day_temp = value.get('day')
             night_temp = value.get('night')
-            
-            if day_temp is not None:
-                print(f"    白天温度: {day_temp:.2f} {unit}")
-            else:
-                print(f"    白天温度: 无数据")
-                
-            if night_temp is not None:
-                print(f"    夜间温度: {night_temp:.2f} {unit}")
-            else:
-                print(f"    夜间温度: 无数据")
-                
+            detail = _LST_TMPL.format_map({
+                'day': f"{day_temp:.2f} {unit}" if day_temp is not None else '无数据',
+                'night': f"{night_temp:.2f} {unit}" if night_temp is not None else '无数据'
+            })
         elif value is not None:
-            if isinstance(value, (int, float)):
-                print(f"    数值: {value:.4f}")
-            else:
-                print(f"    数值: {value}")
+            detail = f"    数值: {value:.4f}" if isinstance(value, (int, float)) else f"    数值: {value}"
         else:
-            print(f"    状态: 无数据 (该区域可能无有效数据)")
+            detail = _NO_DATA_DETAIL
         
-        print()
+        lines.append(_PARAM_TMPL.format_map({
+            'idx': i, 'param': param, 'name': chinese_name,
+            'desc': description, 'unit': unit, 'detail': detail
+        }))
     
     # 数据源信息
     sources = env_data.get('data_sources', {})
     if sources:
-        print("数据源:")
+        lines.append("数据源:")
         for source, description in sources.items():
-            print(f"   {source}: {description}")
+            lines.append(f"   {source}: {description}")
+    
+    log.info('\n'.join(lines))
 
 def print_analysis_summary(weather_data, vegetation_data, env_data):
     """
     打印分析总结
     """
-    print("\n综合分析总结:")
-    print("=" * 60)
+    if not log.isEnabledFor(logging.INFO):
+        return
+    
+    # 输出整体缓冲后一次写出
+    lines = []
+    lines.append("\n综合分析总结:")
+    lines.append("=" * 60)
     
     # 天气状况
     if weather_data and 'current' in weather_data:
@@ -260,7 +306,7 @@ def print_analysis_summary(weather_data, vegetation_data, env_data):
         temp = current.get('temperature', 'N/A')
         humidity = current.get('humidity', 'N/A')
         weather_desc = current.get('description', 'N/A')
-        print(f"天气状况: {weather_desc}, {temp}°C, 湿度{humidity}%")
+        lines.append(f"天气状况: {weather_desc}, {temp}°C, 湿度{humidity}%")
     
     # 植被健康度评估
     if vegetation_data and 'sentinel2_data' in vegetation_data:
@@ -274,7 +320,7 @@ def print_analysis_summary(weather_data, vegetation_data, env_data):
                 health = "一般 (稀疏植被)"
             else:
                 health = "较差 (裸地或无植被)"
-            print(f"植被健康度: {health} (NDVI: {ndvi:.3f})")
+            lines.append(f"植被健康度: {health} (NDVI: {ndvi:.3f})")
     
     # 环境参数可用性
     if env_data and 'summary' in env_data:
@@ -282,7 +328,7 @@ def print_analysis_summary(weather_data, vegetation_data, env_data):
         available = summary.get('available_parameters', 0)
         total = summary.get('total_parameters', 14)
         success_rate = summary.get('success_rate', '0%')
-        print(f"环境参数: {available}/{total} 可用 (成功率: {success_rate})")
+        lines.append(f"环境参数: {available}/{total} 可用 (成功率: {success_rate})")
     
     # 数据质量评估
     quality_score = 0
@@ -294,66 +340,109 @@ def print_analysis_summary(weather_data, vegetation_data, env_data):
         quality_score += 1
     
     quality_levels = ["数据不足", "数据一般", "数据良好", "数据优秀"]
-    print(f"整体数据质量: {quality_levels[min(quality_score, 3)]}")
+    lines.append(f"整体数据质量: {quality_levels[min(quality_score, 3)]}")
+    
+    log.info('\n'.join(lines))
 
 def format_header(lat, lon, days_back):
     """
     格式化输出头部
     """
-    print("=" * 80)
-    print("WeatherG - 天气和环境参数综合查询系统")
-    print("=" * 80)
-    print(f"查询坐标: ({lat}, {lon})")
-    print(f"植被数据回溯: {days_back} 天")
-    print(f"查询时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 80)
+    separator = "=" * 80
+    log.info(separator)
+    log.info("WeatherG - 天气和环境参数综合查询系统")
+    log.info(separator)
+    log.info("查询坐标: (%s, %s)", lat, lon)
+    log.info("植被数据回溯: %s 天", days_back)
+    log.info("查询时间: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    log.info(separator)
+
+def _latitude(value):
+    """argparse参数类型：纬度"""
+    try:
+        lat = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"坐标格式不正确，请输入有效的数字: {value}")
+    if not (-90 <= lat <= 90):
+        raise argparse.ArgumentTypeError("纬度必须在-90到90之间")
+    return lat
+
+def _longitude(value):
+    """argparse参数类型：经度"""
+    try:
+        lon = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"坐标格式不正确，请输入有效的数字: {value}")
+    if not (-180 <= lon <= 180):
+        raise argparse.ArgumentTypeError("经度必须在-180到180之间")
+    return lon
+
+def _days_back(value):
+    """argparse参数类型：植被数据回溯天数"""
+    try:
+        days = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"回溯天数必须是整数: {value}")
+    if days < 1 or days > 365:
+        raise argparse.ArgumentTypeError("回溯天数必须在1到365之间")
+    return days
+
+def setup_logging(quiet=False):
+    """
+    配置命令行输出：消息原样输出到标准输出，quiet时只输出警告和错误
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.handlers[:] = [handler]
+    log.setLevel(logging.WARNING if quiet else logging.INFO)
+    log.propagate = False
+
+def build_arg_parser():
+    """
+    构建命令行参数解析器
+    """
+    parser = argparse.ArgumentParser(
+        prog='weather_cli.py',
+        description='天气和植被参数命令行查询工具',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""示例:
+  python weather_cli.py 39.9042 116.4074        # 北京，默认30天
+  python weather_cli.py 31.2304 121.4737 7      # 上海，回溯7天
+  python weather_cli.py 22.5431 114.0579 15     # 深圳，回溯15天
+
+功能特性:
+  实时天气数据 (Open-Meteo免费API)
+  传统植被参数 (NDVI, EVI, SAVI等)
+  14个环境参数 (LAI, FAPAR, LST, ET, GPP等)
+  多源卫星数据 (Sentinel-2, MODIS)
+  综合数据分析和评估"""
+    )
+    parser.add_argument('latitude', type=_latitude, help='纬度: -90 到 90 之间的数值')
+    parser.add_argument('longitude', type=_longitude, help='经度: -180 到 180 之间的数值')
+    parser.add_argument('days_back', type=_days_back, nargs='?', default=30,
+                        help='可选，植被数据回溯天数 (默认30天)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出警告和错误')
+    return parser
 
 def main():
     """
     主函数
     """
+    parser = build_arg_parser()
     if len(sys.argv) < 3:
-        print("用法: python weather_cli.py <纬度> <经度> [回溯天数]")
-        print()
-        print("参数说明:")
-        print("  纬度: -90 到 90 之间的数值")
-        print("  经度: -180 到 180 之间的数值")
-        print("  回溯天数: 可选，植被数据回溯天数 (默认30天)")
-        print()
-        print("示例:")
-        print("  python weather_cli.py 39.9042 116.4074        # 北京，默认30天")
-        print("  python weather_cli.py 31.2304 121.4737 7      # 上海，回溯7天")
-        print("  python weather_cli.py 22.5431 114.0579 15     # 深圳，回溯15天")
-        print()
-        print("功能特性:")
-        print("  实时天气数据 (Open-Meteo免费API)")
-        print("  传统植被参数 (NDVI, EVI, SAVI等)")
-        print("  14个环境参数 (LAI, FAPAR, LST, ET, GPP等)")
-        print("  多源卫星数据 (Sentinel-2, MODIS)")
-        print("  综合数据分析和评估")
+        parser.print_help()
         return
     
+    # 参数类型转换和范围校验由argparse一次完成
+    args = parser.parse_args()
+    lat, lon, days_back = args.latitude, args.longitude, args.days_back
+    setup_logging(args.quiet)
+    
     try:
-        # 解析命令行参数
-        lat = float(sys.argv[1])
-        lon = float(sys.argv[2])
-        days_back = int(sys.argv[3]) if len(sys.argv) > 3 else 30
-        
-        # 验证坐标范围
-        if not (-90 <= lat <= 90):
-            print("错误: 纬度必须在-90到90之间")
-            return
-        if not (-180 <= lon <= 180):
-            print("错误: 经度必须在-180到180之间")
-            return
-        if days_back < 1 or days_back > 365:
-            print("错误: 回溯天数必须在1到365之间")
-            return
-        
         # 格式化输出头部
         format_header(lat, lon, days_back)
         
-        # 获取综合数据
+        # 先获取综合数据；服务端缓存了天气和植被结果，随后的环境参数请求直接命中缓存
         comprehensive_data = get_weather_and_vegetation_data(lat, lon, days_back)
         
         if comprehensive_data:
@@ -374,27 +463,24 @@ def main():
             # 打印综合分析
             print_analysis_summary(weather_data, vegetation_data, env_params_data)
             
-            print("\n" + "=" * 80)
-            print("查询完成!")
-            print("提示: 部分参数可能因数据源覆盖范围或时间限制而无数据")
-            print("详细API文档: http://localhost:8081/api/status")
-            print("=" * 80)
+            log.info("\n%s", "=" * 80)
+            log.info("查询完成!")
+            log.info("提示: 部分参数可能因数据源覆盖范围或时间限制而无数据")
+            log.info("详细API文档: http://localhost:8081/api/status")
+            log.info("=" * 80)
         
         else:
-            print("\n数据获取失败!")
-            print("请检查:")
-            print("1. 后端服务是否已启动: cd src && python weather_vegetation_service.py")
-            print("2. Google Earth Engine认证是否正确")
-            print("3. 网络连接是否正常")
-            print("4. 坐标是否有效")
+            log.error("\n数据获取失败!")
+            log.error("请检查:")
+            log.error("1. 后端服务是否已启动: cd src && python weather_vegetation_service.py")
+            log.error("2. Google Earth Engine认证是否正确")
+            log.error("3. 网络连接是否正常")
+            log.error("4. 坐标是否有效")
     
-    except ValueError:
-        print("错误: 坐标格式不正确，请输入有效的数字")
-        print("示例: python weather_cli.py 39.9042 116.4074 30")
     except KeyboardInterrupt:
-        print("\n\n用户中断查询")
+        log.warning("\n\n用户中断查询")
     except Exception as e:
-        print(f"未知错误: {e}")
+        log.error("未知错误: %s", e)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file